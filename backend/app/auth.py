@@ -14,7 +14,7 @@ from passlib.context import CryptContext
 from pydantic import SecretStr
 
 from app.config import settings
-from app.services.cosmos_service import CosmosService
+from app.services.cosmos_service import QUERY_USER_BY_IDENTIFIER, CosmosService
 
 logger = logging.getLogger(__name__)
 
@@ -160,10 +160,9 @@ async def authenticate_user(
     Note:
         Authentication failures are logged for security monitoring.
     """
-    query = "SELECT * FROM c WHERE c.email_lower = @identifier or c.username_lower = @identifier"
     parameters = [{"name": "@identifier", "value": identifier.lower()}]
     users = await cosmos_service.get_items_by_query(
-        query=query, container_type="users", parameters=parameters
+        query=QUERY_USER_BY_IDENTIFIER, container_type="users", parameters=parameters
     )
 
     # By default, assume failure and set up for a dummy check.
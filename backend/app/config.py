@@ -10,6 +10,8 @@ class Settings:
     COSMOS_ENDPOINT = os.getenv("COSMOS_ENDPOINT")
     COSMOS_DATABASE_NAME = os.getenv("COSMOS_DATABASE_NAME")
     BLOB_ENDPOINT = os.getenv("BLOB_ENDPOINT")
+    IDENTITY_ENDPOINT = os.getenv("IDENTITY_ENDPOINT")  # Set by Azure hosting
+    AZURE_CLIENT_ID = os.getenv("AZURE_CLIENT_ID")  # User-assigned identity
     APPLICATIONINSIGHTS_CONNECTION_STRING = os.getenv(
         "APPLICATIONINSIGHTS_CONNECTION_STRING"
     )
@@ -26,6 +28,9 @@ class Settings:
     # const variables
     ACCESS_TOKEN_EXPIRE_MINUTES = 30  # Token valid for 30 minutes
     REFRESH_TOKEN_EXPIRE_DAYS = 14  # Token valid for 14 days
+    REDIS_MAX_CONNECTIONS = 64  # Connections shared by the whole process
+    REDIS_POOL_TIMEOUT = 5  # Seconds to wait for a free pooled connection
+    REDIS_HEALTH_CHECK_INTERVAL = 30  # Seconds between idle connection checks
 
 
 settings = Settings()
@@ -0,0 +1,35 @@
+"""credentials.py
+
+Provides the Azure credential shared by every service client.
+"""
+
+import logging
+from functools import lru_cache
+
+from azure.core.credentials_async import AsyncTokenCredential
+from azure.identity.aio import DefaultAzureCredential, ManagedIdentityCredential
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache
+def get_azure_credential() -> AsyncTokenCredential:
+    """Returns the process-wide Azure credential.
+
+    Azure hosting sets IDENTITY_ENDPOINT, where managed identity is the only
+    valid source, so it is used directly instead of probing the whole
+    DefaultAzureCredential chain on every token refresh. AZURE_CLIENT_ID
+    selects a user-assigned identity, as it did for the default chain.
+    Anywhere else the default chain picks up developer credentials.
+
+    Returns:
+        AsyncTokenCredential: Credential shared by all Azure clients.
+    """
+    if settings.IDENTITY_ENDPOINT:
+        logger.info("Using managed identity credential")
+        return ManagedIdentityCredential(client_id=settings.AZURE_CLIENT_ID)
+
+    logger.info("Using default Azure credential chain")
+    return DefaultAzureCredential()
@@ -1,6 +1,8 @@
 import asyncio
 import logging
+import queue
 from contextlib import asynccontextmanager
+from logging.handlers import QueueHandler, QueueListener
 
 from azure.monitor.opentelemetry import configure_azure_monitor
 from fastapi import FastAPI
@@ -9,7 +11,13 @@ from opentelemetry import _logs, trace
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
 from app.config import settings
-from app.dependencies import get_blob_service, get_cosmos_service, get_redis_service
+from app.credentials import get_azure_credential
+from app.dependencies import (
+    get_blob_service,
+    get_connection_service,
+    get_cosmos_service,
+    get_redis_service,
+)
 from app.redis_listener import RedisListener
 from app.routers import (
     accounts_router,
@@ -43,10 +51,14 @@ async def lifespan(app: FastAPI):
     except asyncio.CancelledError:
         pass
 
+    # Publish any queued events before Redis goes away
+    await get_connection_service().close()
+
     # Database/Storage Clients
     await get_blob_service().close()
     await get_cosmos_service().close()
     await get_redis_service().close()
+    await get_azure_credential().close()
 
     # OpenTelemetry
     tracer_provider = trace.get_tracer_provider()
@@ -56,6 +68,9 @@ async def lifespan(app: FastAPI):
     if hasattr(logger_provider, "shutdown"):
         logger_provider.shutdown()
 
+    # Flush queued log records
+    log_listener.stop()
+
 
 app = FastAPI(lifespan=lifespan)
 
@@ -76,6 +91,37 @@ app.add_middleware(
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
+
+
+def start_log_listener() -> QueueListener:
+    """Moves blocking log output to a background thread.
+
+    Stream handlers on the root logger write to stderr/files, which can stall
+    the event loop. They are replaced by a QueueHandler and driven by a
+    QueueListener thread instead. Other handlers, like the OpenTelemetry
+    exporter, already batch in the background and stay on the root logger so
+    they still see the trace context of the request that logged.
+
+    Returns:
+        QueueListener: The started listener, stop it on shutdown.
+    """
+    root = logging.getLogger()
+    stream_handlers = [
+        handler
+        for handler in root.handlers
+        if isinstance(handler, logging.StreamHandler)
+    ]
+    for handler in stream_handlers:
+        root.removeHandler(handler)
+
+    log_queue = queue.SimpleQueue()
+    root.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *stream_handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
+log_listener = start_log_listener()
 logger = logging.getLogger(__name__)
 
 FastAPIInstrumentor.instrument_app(app)
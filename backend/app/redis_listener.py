@@ -5,9 +5,10 @@ and dispatches incoming messages to appropriate handlers for real-time game and
 """
 
 import asyncio
+import json
 import logging
 
-from pydantic import ValidationError, validate_call
+from pydantic import ValidationError
 
 from app.dependencies import (
     get_chat_service,
@@ -15,7 +16,13 @@ from app.dependencies import (
     get_redis_service,
     get_room_service,
 )
-from app.schemas import BroadcastPayload, ChatMessage, GameUpdate, PubSubMessage
+from app.schemas import (
+    BroadcastPayload,
+    ChatMessage,
+    GameUpdate,
+    PubSubBatch,
+    PubSubMessage,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -63,16 +70,17 @@ class RedisListener:
                     ignore_subscribe_messages=True, timeout=1.0
                 )
                 if message:
-                    # Get data from pubsub message
-                    envelope = PubSubMessage.model_validate_json(message["data"])
-                    channel = envelope.channel
-                    payload = BroadcastPayload.model_validate(envelope.payload)
-
-                    # Get handler based on channel name
-                    handler = self._handler_map.get(channel, self.handle_default)
-
-                    # Call handler function with message payload
-                    await handler(payload)
+                    # Only the outer shape is checked here, each envelope is
+                    # validated on its own in dispatch. Lone events and
+                    # servers of the previous release send a single envelope
+                    data = json.loads(message["data"])
+                    if isinstance(data, dict) and "batch" in data:
+                        envelopes = PubSubBatch.model_validate(data).batch
+                    else:
+                        envelopes = [data]
+
+                    for envelope in envelopes:
+                        await self.dispatch(envelope)
             except asyncio.CancelledError:
                 logger.info("Redis listener is shutting down.")
                 break
@@ -80,6 +88,26 @@ class RedisListener:
                 logger.exception("Error in Redis listener.")
                 await asyncio.sleep(1)
 
+    async def dispatch(self, envelope: dict):
+        """Validates one envelope of a batch and calls its handler.
+
+        Errors are logged and not raised, so one bad envelope or failing
+        handler does not drop the rest of the batch.
+
+        Args:
+            envelope (dict): Raw envelope with the channel type and payload.
+        """
+        try:
+            pubsub_message = PubSubMessage.model_validate(envelope)
+
+            # Get handler based on channel name
+            handler = self._handler_map.get(pubsub_message.channel, self.handle_default)
+
+            # Call handler function with message payload
+            await handler(pubsub_message.payload)
+        except Exception:
+            logger.exception("Error handling Redis pub/sub message.")
+
     async def handle_game_update(self, payload: BroadcastPayload):
         """Game update handler, sends new game state to room.
 
@@ -99,7 +127,6 @@ class RedisListener:
 
         await self._connection_service.broadcast(payload)
 
-    @validate_call
     async def handle_chat_message(self, payload: BroadcastPayload):
         """Chat message handler, sends chat message to users in user list.
 
@@ -110,9 +137,7 @@ class RedisListener:
         message_data = payload.message
         ChatMessage.model_validate(message_data)
 
-        await self._connection_service.broadcast(
-            payload=BroadcastPayload(user_list=payload.user_list, message=message_data)
-        )
+        await self._connection_service.broadcast(payload)
 
     async def handle_default(self, payload: BroadcastPayload):
         """Default handler, sends payload to all users in user list.
@@ -111,10 +111,16 @@ async def get_chat_log(
     chat_service: ChatService = Depends(get_chat_service),
 ):
     try:
-        chat_log = await chat_service.get_chat_log(chat_id=chat_id)
-        return chat_log
+        # The log is already stored as JSON, return it without rebuilding models
+        chat_log = await chat_service.get_chat_log_json(chat_id=chat_id)
+        if chat_log is None:
+            raise HTTPException(status_code=404, detail="Chat not found")
+
+        return Response(content=chat_log, media_type="application/json")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e)) from e
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(f"An unexpected error occurred in get_chat_log: {e}")
         raise HTTPException(
@@ -1,11 +1,11 @@
 import logging
 from typing import Any
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 
 from app import auth
 from app.dependencies import get_game_service_factory, get_room_service
-from app.schemas import Room, RoomCreate
+from app.schemas import Page, Room, RoomCreate
 from app.services.game_service_factory import GameServiceFactory
 from app.services.games.chess.chess_interface import ChessState
 from app.services.games.lands.lands_interface import LandsState
@@ -95,6 +95,26 @@ async def delete_room(
         ) from e
 
 
+@router.get("/page", response_model=Page[dict[str, Any]])
+async def list_rooms_page(
+    page_size: int = Query(default=50, ge=1, le=500),
+    cursor: str | None = None,
+    room_service: RoomService = Depends(get_room_service),
+):
+    try:
+        return await room_service.get_rooms_page(
+            page_size=page_size, continuation_token=cursor
+        )
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(f"Failed to list rooms page: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An internal error occurred while fetching rooms.",
+        ) from e
+
+
 @router.get("/{room_id}", response_model=Room)
 async def get_room(
     room_id: str,
@@ -175,7 +175,9 @@ class ConnectionEndpoint(WebSocketEndpoint):
 
         """
         if hasattr(self, "user_id"):
-            self.connection_service.disconnect(user_id=self.user_id)
+            self.connection_service.disconnect(
+                user_id=self.user_id, websocket=websocket
+            )
             logger.info(
                 f"User '{self.user_id}' disconnected from websocket endpoint: {close_code}"
             )
@@ -233,7 +235,7 @@ class ConnectionEndpoint(WebSocketEndpoint):
             await self.connection_service.publish_event(
                 channel="game_update",
                 user_list=user_list,
-                message_data=game_update.model_dump(),
+                message_data=game_update.model_dump(mode="json"),
             )
 
     async def handle_chat_message(self, payload: dict):
@@ -272,7 +274,7 @@ class ConnectionEndpoint(WebSocketEndpoint):
             await self.connection_service.publish_event(
                 channel="chat_message",
                 user_list=user_list,
-                message_data=chat_message.model_dump(),
+                message_data=chat_message.model_dump(mode="json"),
             )
         else:
             logger.warning(f"Invalid chat message payload: {payload}")
@@ -1,5 +1,5 @@
 import datetime
-from typing import Any
+from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel, EmailStr, Field, SecretStr, model_validator
 
@@ -38,6 +38,15 @@ class UserLogin(BaseModel):
     )
 
 
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    items: list[T]
+    # Opaque cursor for the next page, None on the last page
+    next: str | None = None
+
+
 class Room(BaseModel):
     id: str
     room_id: str
@@ -58,7 +67,8 @@ class RoomCreate(BaseModel):
 
 
 class BroadcastPayload(BaseModel):
-    user_list: set[str]
+    # Sets from Redis are already unique, a tuple validates without hashing
+    user_list: tuple[str, ...]
     message: dict[str, Any]
 
     @model_validator(mode="after")
@@ -81,6 +91,11 @@ class PubSubMessage(BaseModel):
     payload: BroadcastPayload
 
 
+class PubSubBatch(BaseModel):
+    # Envelopes are validated one by one, so a bad one only costs itself
+    batch: list[dict[str, Any]]
+
+
 class GameUpdate(BaseModel):
     room_id: str
     game_state: dict
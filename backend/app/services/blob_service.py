@@ -2,10 +2,10 @@ import logging
 from typing import Any
 
 from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
-from azure.identity.aio import DefaultAzureCredential
 from azure.storage.blob.aio import BlobServiceClient
 
 from app.config import settings
+from app.credentials import get_azure_credential
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +15,7 @@ class BlobService:
         self.client: BlobServiceClient
         if settings.BLOB_ENDPOINT:
             logger.info("Initializing Blob Service Client with Azure Credentials")
-            credential = DefaultAzureCredential()
+            credential = get_azure_credential()
             self.client = BlobServiceClient(
                 account_url=settings.BLOB_ENDPOINT, credential=credential
             )
@@ -45,19 +45,21 @@ class BlobService:
                 await container_client.get_container_properties()
             except ResourceNotFoundError:
                 await container_client.create_container()
-                logger.info(f"Container '{container_name}' created.")
+                logger.info("Container '%s' created.", container_name)
 
             blob_client = container_client.get_blob_client(filename)
             await blob_client.upload_blob(blobstream, overwrite=True)
             logger.info(
-                f"Blob '{filename}' uploaded successfully to container '{container_name}'"
+                "Blob '%s' uploaded successfully to container '%s'",
+                filename,
+                container_name,
             )
 
         except HttpResponseError as e:
-            logger.error(f"Azure Storage request failed: {e.message}")
+            logger.error("Azure Storage request failed: %s", e.message)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error during blob upload: {e}")
+            logger.error("Unexpected error during blob upload: %s", e)
             raise
 
     async def get_blob(self, container_name: str, filename: str) -> bytes:
@@ -71,17 +73,19 @@ class BlobService:
             stream = await blob_client.download_blob()
             data = await stream.readall()
             logger.info(
-                f"Blob '{filename}' retrieved from container '{container_name}'"
+                "Blob '%s' retrieved from container '%s'", filename, container_name
             )
             return data
         except ResourceNotFoundError:
-            logger.error(f"Blob '{filename}' not found in container '{container_name}'")
+            logger.error(
+                "Blob '%s' not found in container '%s'", filename, container_name
+            )
             raise
         except HttpResponseError as e:
-            logger.error(f"Azure Storage request failed: {e.message}")
+            logger.error("Azure Storage request failed: %s", e.message)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error during blob retrieval: {e}")
+            logger.error("Unexpected error during blob retrieval: %s", e)
             raise
 
     async def delete_blob(self, container_name: str, filename: str):
@@ -93,14 +97,18 @@ class BlobService:
             container_client = self.client.get_container_client(container_name)
             blob_client = container_client.get_blob_client(filename)
             await blob_client.delete_blob()
-            logger.info(f"Blob '{filename}' deleted from container '{container_name}'")
+            logger.info(
+                "Blob '%s' deleted from container '%s'", filename, container_name
+            )
         except ResourceNotFoundError:
             logger.warning(
-                f"Attempted to delete blob '{filename}', but does not exist in container {container_name}"
+                "Attempted to delete blob '%s', but does not exist in container %s",
+                filename,
+                container_name,
             )
         except HttpResponseError as e:
-            logger.error(f"Azure Storage request failed: {e.message}")
+            logger.error("Azure Storage request failed: %s", e.message)
             raise
         except Exception as e:
-            logger.error(f"Unexpected error during blob deletion: {e}")
+            logger.error("Unexpected error during blob deletion: %s", e)
             raise
@@ -1,22 +1,86 @@
-"""services/room_service.py
+"""services/chat_service.py
 
-This module defines the RoomService, which is responsible for managing
-the business logic and state of game rooms.
+This module defines the ChatService, which is responsible for managing
+the business logic and state of chats.
 """
 
+import asyncio
 import json
 import logging
 import uuid
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
 
 from fastapi import HTTPException
+from pydantic import TypeAdapter
 
 from app.schemas import Chat, ChatMessage
-from app.services.cosmos_service import CosmosService
+from app.services.cosmos_service import QUERY_ALL_ITEMS, CosmosService
 from app.services.redis_service import RedisService
 
 logger = logging.getLogger(__name__)
 
+# Chat logs are cached in Redis as a list of JSON encoded messages, and
+# serialized as a JSON array when read from the database
+_CHAT_LOG_ADAPTER = TypeAdapter(list[ChatMessage])
+
+# Appends a message to the cached log only if the chat is cached and the
+# sender is a member, so a non-member never reaches the log.
+# KEYS: chat hash, chat users, chat log. ARGV: user ID, message JSON.
+# Returns the new log length, 0 if the chat is not cached, -1 if the user
+# is not in the cached user set.
+_APPEND_IF_MEMBER = """
+if redis.call("EXISTS", KEYS[1]) == 0 then
+    return 0
+end
+if redis.call("SISMEMBER", KEYS[2], ARGV[1]) == 0 then
+    return -1
+end
+return redis.call("RPUSH", KEYS[3], ARGV[2])
+"""
+
+# Chat fields cached under their own Redis keys instead of the chat hash
+_CHAT_HASH_EXCLUDE = frozenset({"users", "bots", "chat_log"})
+
+
+@dataclass(frozen=True, slots=True)
+class ChatKeys:
+    """Redis keys used to cache a single chat.
+
+    The chat ID is wrapped in a hash tag (``{...}``) so every key of a chat
+    hashes to the same Redis Cluster slot and can be used together in one
+    pipeline or transaction. Operations that span several chats or users,
+    such as clearing the chat of every user on delete, still touch
+    multiple slots.
+
+    Instances are cached per chat ID so hot paths reuse the same key strings
+    instead of formatting them on every call.
+    """
+
+    base: str
+    users: str
+    bots: str
+    # A Redis list, so messages are appended without rewriting the log
+    log: str
+
+    @classmethod
+    @lru_cache(maxsize=1024)
+    def for_chat(cls, chat_id: str) -> "ChatKeys":
+        base = f"chat:{{{chat_id}}}"
+        return cls(
+            base=base,
+            users=f"{base}:users",
+            bots=f"{base}:bots",
+            log=f"{base}:messages",
+        )
+
+
+@lru_cache(maxsize=1024)
+def user_chat_key(user_id: str) -> str:
+    """Redis key holding the ID of the chat a user is currently in."""
+    return f"user:{{{user_id}}}:chat"
+
 
 class ChatService:
     def __init__(
@@ -31,66 +95,56 @@ class ChatService:
         if not user_id:
             raise ValueError("User ID missing on chat creation")
 
+        chat_id = str(uuid.uuid4())
+        keys = ChatKeys.for_chat(chat_id)
+
         # Currently user can only be in one chat room at a time
-        if await self.get_user_chat(user_id=user_id):
-            logger.warning(f"User '{user_id}' currently in another chat room")
+        if not await self._claim_user_chat(user_id=user_id, chat_id=chat_id):
+            logger.warning("User '%s' currently in another chat room", user_id)
             raise HTTPException(
                 status_code=409,
                 detail="User already in another chat room",
             )
-
-        chat_id = str(uuid.uuid4())
         chat = Chat(
             id=chat_id,
             room_id=room_id,
             users={user_id},  # Only user can create a chat room
         )
 
+        # Dump once and derive the Redis hash from the Cosmos document
         cosmos_chat = chat.model_dump(mode="json")
-        redis_chat = chat.model_dump(exclude={"users", "chat_log", "bots"}, mode="json")
+        redis_chat = {
+            field: value
+            for field, value in cosmos_chat.items()
+            if field not in _CHAT_HASH_EXCLUDE
+        }
 
         try:
             # Write new chat into redis
-            await self._redis_service.dict_add(
-                key=f"chat:{chat_id}", mapping=redis_chat
-            )
-            await self._redis_service.expire(f"chat:{chat_id}", 86400)
+            await self._cache_chat(keys=keys, chat_fields=redis_chat, chat=chat)
+        except HTTPException as e:
+            logger.warning("Redis unavailable for creating chat room: %s", e)
 
-            await self._redis_service.set_add(
-                key=f"chat:{chat_id}:users", values=chat.users
+        # Release the claim if creating fails, or the user stays locked out
+        try:
+            # Write new chat room into cosmos
+            await self._cosmos_service.add_item(
+                item=cosmos_chat, container_type="chats"
             )
-            await self._redis_service.expire(f"chat:{chat_id}:users", 86400)
 
-            await self._redis_service.set_add(
-                key=f"chat:{chat_id}:bots", values=chat.bots
-            )
-            await self._redis_service.expire(f"chat:{chat_id}:bots", 86400)
+            # Add current chat room to user information.
+            # User can only be in one chat at a time for now
+            patch_operation = [{"op": "add", "path": "/chat", "value": chat_id}]
 
-            await self._redis_service.set_value(
-                key=f"chat:{chat_id}:log", value=chat.chat_log
-            )
-            await self._redis_service.expire(f"chat:{chat_id}:log", 86400)
-
-            # Write user into new chat room
-            await self._redis_service.set_value(
-                key=f"user:{user_id}:chat", value=chat_id
+            await self._cosmos_service.patch_item(
+                item_id=user_id,
+                partition_key=user_id,
+                patch_operations=patch_operation,
+                container_type="users",
             )
-        except HTTPException as e:
-            logger.warning(f"Redis unavailable for creating chat room: {e}")
-
-        # Write new chat room into cosmos
-        await self._cosmos_service.add_item(item=cosmos_chat, container_type="chats")
-
-        # Add current chat room to user information.
-        # User can only be in one chat at a time for now
-        patch_operation = [{"op": "add", "path": "/chat", "value": chat_id}]
-
-        await self._cosmos_service.patch_item(
-            item_id=user_id,
-            partition_key=user_id,
-            patch_operations=patch_operation,
-            container_type="users",
-        )
+        except Exception:
+            await self._release_user_chat(user_id=user_id)
+            raise
 
         return chat
 
@@ -101,51 +155,57 @@ class ChatService:
         if not user_id:
             raise ValueError("User ID missing on join chat room")
 
-        if await self.get_user_chat(user_id=user_id):
-            logger.warning(
-                f"User '{user_id}' currently in another chat, unable to join {chat_id}"
-            )
-            raise HTTPException(
-                status_code=409,
-                detail="User already in another chat",
-            )
+        keys = ChatKeys.for_chat(chat_id)
+
         user_list = await self.get_user_list(chat_id=chat_id)
 
         # Sanity check to ensure chat room exists
         if user_list is None:
             logger.error("User list not found in redis and cosmos")
             raise ValueError("User list missing in redis and cosmos")
-        try:
-            await self._redis_service.set_add(
-                key=f"chat:{chat_id}:users", values=[user_id]
+
+        if not await self._claim_user_chat(user_id=user_id, chat_id=chat_id):
+            logger.warning(
+                "User '%s' currently in another chat, unable to join %s",
+                user_id,
+                chat_id,
             )
-            await self._redis_service.set_value(
-                key=f"user:{user_id}:chat", value=chat_id
+            raise HTTPException(
+                status_code=409,
+                detail="User already in another chat",
             )
-            await self._redis_service.expire(f"user:{user_id}:chat", 86400)
-            await self._redis_service.expire(f"chat:{chat_id}:users", 86400)
-        except HTTPException as e:
-            logger.warning(f"Redis unavailable for joining room: {e}")
+        # Release the claim if joining fails, or the user stays locked out
+        try:
+            try:
+                async with self._redis_service.pipeline() as pipe:
+                    pipe.sadd(keys.users, user_id)
+                    pipe.expire(keys.users, 86400)
+                    await pipe.execute()
+            except HTTPException as e:
+                logger.warning("Redis unavailable for joining room: %s", e)
 
-        # Add user to room list
-        patch_operation = [{"op": "add", "path": "/users/-", "value": user_id}]
+            # Add user to room list
+            patch_operation = [{"op": "add", "path": "/users/-", "value": user_id}]
 
-        await self._cosmos_service.patch_item(
-            item_id=chat_id,
-            partition_key=chat_id,
-            patch_operations=patch_operation,
-            container_type="chats",
-        )
+            await self._cosmos_service.patch_item(
+                item_id=chat_id,
+                partition_key=chat_id,
+                patch_operations=patch_operation,
+                container_type="chats",
+            )
 
-        # Add current chat to user information
-        patch_operation = [{"op": "add", "path": "/chat", "value": chat_id}]
+            # Add current chat to user information
+            patch_operation = [{"op": "add", "path": "/chat", "value": chat_id}]
 
-        await self._cosmos_service.patch_item(
-            item_id=user_id,
-            partition_key=user_id,
-            patch_operations=patch_operation,
-            container_type="users",
-        )
+            await self._cosmos_service.patch_item(
+                item_id=user_id,
+                partition_key=user_id,
+                patch_operations=patch_operation,
+                container_type="users",
+            )
+        except Exception:
+            await self._release_user_chat(user_id=user_id)
+            raise
 
     async def leave_chat(self, chat_id: str, user_id: str):
         if not chat_id:
@@ -153,30 +213,30 @@ class ChatService:
         if not user_id:
             raise ValueError("User ID missing on leave chat")
 
+        keys = ChatKeys.for_chat(chat_id)
+
         chat = await self.get_chat(chat_id=chat_id)
 
         # Only user in chat, delete chat
         if len(chat.users) == 1:
-            logger.info(f"No more users in chat '{chat_id}', deleting chat")
+            logger.info("No more users in chat '%s', deleting chat", chat_id)
             await self.delete_chat(chat_id=chat_id)
             return
 
         if chat is None:
             logger.warning(
-                f"Chat '{chat_id}' not found when leaving for user '{user_id}'"
+                "Chat '%s' not found when leaving for user '%s'", chat_id, user_id
             )
             raise HTTPException(
                 status_code=404,
                 detail="Chat not found",
             )
         try:
-            await self._redis_service.set_remove(
-                key=f"chat:{chat_id}:users", values=[user_id]
-            )
+            await self._redis_service.set_remove(key=keys.users, values=[user_id])
 
-            await self._redis_service.delete_keys(keys=[f"user:{user_id}:chat"])
+            await self._redis_service.delete_keys(keys=[user_chat_key(user_id)])
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for leaving chat: {e}")
+            logger.warning("Redis unavailable for leaving chat: %s", e)
 
         try:
             item = await self._cosmos_service.get_item(
@@ -198,15 +258,15 @@ class ChatService:
                     container_type="chats",
                 )
             else:
-                logger.warning(f"User list not found in cosmos for chat '{chat_id}'")
+                logger.warning("User list not found in cosmos for chat '%s'", chat_id)
                 raise HTTPException(
                     status_code=404,
                     detail=f"User '{user_id}' not found in chat '{chat_id}'",
                 )
         except ValueError:
-            logger.warning(f"Tag '{chat_id}' not found in the list, no changes made.")
+            logger.warning("Tag '%s' not found in the list, no changes made.", chat_id)
         except Exception as e:
-            logger.error(f"An error occurred: {e}")
+            logger.error("An error occurred: %s", e)
 
         patch_operation = [{"op": "remove", "path": "/chat"}]
 
@@ -218,35 +278,37 @@ class ChatService:
         )
 
     async def get_chat(self, chat_id: str) -> Chat | None:
+        keys = ChatKeys.for_chat(chat_id)
         try:
-            chat_data = await self._redis_service.dict_get_all(key=f"chat:{chat_id}")
-            if chat_data:
-                await self._redis_service.expire(f"chat:{chat_id}", 86400)
-            user_set = await self._redis_service.set_get(key=f"chat:{chat_id}:users")
-            if user_set:
-                await self._redis_service.expire(f"chat:{chat_id}:users", 86400)
-            bot_set = await self._redis_service.set_get(key=f"chat:{chat_id}:bots")
-            if bot_set is not None:
-                await self._redis_service.expire(f"chat:{chat_id}:bots", 86400)
-            chat_log = await self._redis_service.get_value(key=f"chat:{chat_id}:log")
-            if chat_log is not None:
-                await self._redis_service.expire(f"chat:{chat_id}:log", 86400)
-            if chat_data and user_set is not None and chat_log is not None:
+            # Read every key of the chat and refresh their TTLs in one round
+            # trip, EXPIRE leaves missing keys alone
+            async with self._redis_service.pipeline() as pipe:
+                pipe.hgetall(keys.base)
+                pipe.smembers(keys.users)
+                pipe.smembers(keys.bots)
+                pipe.lrange(keys.log, 0, -1)
+                for key in (keys.base, keys.users, keys.bots, keys.log):
+                    pipe.expire(key, 86400)
+                chat_data, user_set, bot_set, chat_log, *_ = await pipe.execute()
+            # The log is cached together with the hash, an empty log has no key
+            if chat_data and user_set:
                 # Combine the data into a single dictionary
                 full_chat_data = chat_data | {
                     "users": user_set,
                     "bots": bot_set,
-                    "chat_log": json.loads(chat_log),
+                    "chat_log": [json.loads(message) for message in chat_log],
                 }
                 return Chat.model_validate(full_chat_data)
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for getting chat: {e}")
+            logger.warning("Redis unavailable for getting chat: %s", e)
         except Exception as e:
             logger.warning(
-                f"Failed to reconstruct chat from Redis for '{chat_id}': {e}. Fetching from DB"
+                "Failed to reconstruct chat from Redis for '%s': %s. Fetching from DB",
+                chat_id,
+                e,
             )
 
-        logger.info(f"Chat '{chat_id}' is incomplete in cache, checking database")
+        logger.info("Chat '%s' is incomplete in cache, checking database", chat_id)
 
         chat_data_from_db = await self._cosmos_service.get_item(
             item_id=chat_id, partition_key=chat_id, container_type="chats"
@@ -255,79 +317,105 @@ class ChatService:
         if chat_data_from_db:
             try:
                 chat_object = Chat.model_validate(chat_data_from_db)
-                logger.info(f"Restoring chat '{chat_id}' to Redis cache.")
+                logger.info("Restoring chat '%s' to Redis cache.", chat_id)
 
                 # Separate the data for storage
                 chat_data = chat_object.model_dump(
-                    exclude={"users", "bots", "chat_log"}, mode="json"
+                    exclude=_CHAT_HASH_EXCLUDE, mode="json"
                 )
                 try:
                     # Write to the separate Redis keys
-                    await self._redis_service.dict_add(
-                        key=f"chat:{chat_id}", mapping=chat_data
-                    )
-                    await self._redis_service.set_add(
-                        key=f"chat:{chat_id}:users", values=chat_object.users
-                    )
-                    await self._redis_service.set_add(
-                        key=f"chat:{chat_id}:bots", values=chat_object.bots
-                    )
-                    await self._redis_service.set_value(
-                        key=f"chat:{chat_id}:log",
-                        value=json.dumps(chat_object.chat_log),
+                    await self._cache_chat(
+                        keys=keys, chat_fields=chat_data, chat=chat_object
                     )
-                    await self._redis_service.expire(f"chat:{chat_id}", 86400)
-                    await self._redis_service.expire(f"chat:{chat_id}:users", 86400)
-                    await self._redis_service.expire(f"chat:{chat_id}:bots", 86400)
-                    await self._redis_service.expire(f"chat:{chat_id}:log", 86400)
                 except HTTPException as e:
-                    logger.warning(f"Redis unavailable for writing new chat: {e}")
+                    logger.warning("Redis unavailable for writing new chat: %s", e)
 
                 return chat_object
             except Exception as e:
-                logger.error(f"Invalid chat data in CosmosDB for '{chat_id}': {e}")
+                logger.error("Invalid chat data in CosmosDB for '%s': %s", chat_id, e)
                 return None
 
-        logger.warning(f"Chat '{chat_id}' not found in any data source.")
+        logger.warning("Chat '%s' not found in any data source.", chat_id)
         return None
 
     async def get_chat_log(self, chat_id: str) -> list[ChatMessage] | None:
+        """Gets the chat log of a chat as a list of messages.
+
+        Args:
+            chat_id (str): The chat ID of the chat to get the log of.
+
+        Raises:
+            ValueError: If the chat ID is missing.
+
+        Returns:
+            Optional[list[ChatMessage]]: The messages of the chat, oldest first.
+        """
+        chat_log = await self.get_chat_log_json(chat_id=chat_id)
+        if chat_log is None:
+            return None
+
+        return _CHAT_LOG_ADAPTER.validate_json(chat_log)
+
+    async def get_chat_log_json(self, chat_id: str) -> str | bytes | None:
+        """Gets the chat log of a chat as a serialized JSON array.
+
+        The cached messages are joined into an array as stored in Redis, so
+        callers that only forward it, like the HTTP endpoint, skip building a
+        model per message. Only the database fallback goes through validation.
+
+        Args:
+            chat_id (str): The chat ID of the chat to get the log of.
+
+        Raises:
+            ValueError: If the chat ID is missing.
+
+        Returns:
+            Optional[str | bytes]: The JSON array of messages of the chat.
+        """
         if not chat_id:
             raise ValueError("Chat ID missing on getting chat log")
 
+        keys = ChatKeys.for_chat(chat_id)
+
         try:
-            chat_log = await self._redis_service.get_value(key=f"chat:{chat_id}:log")
-            if chat_log:
-                await self._redis_service.expire(f"chat:{chat_id}:log", 86400)
-                return [ChatMessage.model_validate(msg) for msg in json.loads(chat_log)]
+            # The log is cached with the chat hash, an empty log has no key
+            async with self._redis_service.pipeline() as pipe:
+                pipe.exists(keys.base)
+                pipe.lrange(keys.log, 0, -1)
+                pipe.expire(keys.base, 86400)
+                pipe.expire(keys.log, 86400)
+                chat_cached, messages, *_ = await pipe.execute()
+            if chat_cached:
+                return f"[{','.join(messages)}]"
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for getting chat log: {e}")
+            logger.warning("Redis unavailable for getting chat log: %s", e)
 
-        logger.warning(f"Chat log for '{chat_id}' not found in redis, checking cosmos")
+        logger.warning("Chat log for '%s' not found in redis, checking cosmos", chat_id)
         chat_data = await self._cosmos_service.get_item(
             item_id=chat_id, partition_key=chat_id, container_type="chats"
         )
 
         if chat_data:
-            return [
-                ChatMessage.model_validate(msg) for msg in chat_data.get("chat_log", [])
-            ]
+            chat_log = _CHAT_LOG_ADAPTER.validate_python(chat_data.get("chat_log", []))
+            return _CHAT_LOG_ADAPTER.dump_json(chat_log)
 
-        logger.warning(f"Chat log for '{chat_id}' not found in any data source.")
+        logger.warning("Chat log for '%s' not found in any data source.", chat_id)
         return None
 
     async def delete_chat(self, chat_id: str):
         if not chat_id:
             raise ValueError("Chat ID missing on chat deletion")
 
-        chat_key = f"chat:{chat_id}"
+        keys = ChatKeys.for_chat(chat_id)
+        chat_key = keys.base
 
         keys_to_delete: list[str] = [chat_key]
         user_list = await self.get_user_list(chat_id=chat_id)
 
         # Getting all keys for user chat in redis
         for user_id in user_list:
-            keys_to_delete.append(f"user:{user_id}:chat")
+            keys_to_delete.append(user_chat_key(user_id))
         try:
             # Get all chat keys in redis
             keys_to_delete += await self._redis_service.scan_keys(key=chat_key)
@@ -335,38 +423,137 @@ class ChatService:
             # Deleting all keys in redis
             await self._redis_service.delete_keys(keys=keys_to_delete)
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for deleting chat: {e}")
+            logger.warning("Redis unavailable for deleting chat: %s", e)
 
         # Deleting chat in cosmos
         await self._cosmos_service.delete_item(
             item_id=chat_id, partition_key=chat_id, container_type="chats"
         )
 
-        # Deleting chat from user information in cosmos
-        for user_id in user_list:
-            patch_operation = [{"op": "remove", "path": "/chat"}]
+        # Deleting chat from user information in cosmos, every user document is
+        # its own partition so the patches are sent concurrently
+        patch_operation = [{"op": "remove", "path": "/chat"}]
 
-            await self._cosmos_service.patch_item(
-                item_id=user_id,
-                partition_key=user_id,
-                patch_operations=patch_operation,
-                container_type="users",
+        await asyncio.gather(
+            *(
+                self._cosmos_service.patch_item(
+                    item_id=user_id,
+                    partition_key=user_id,
+                    patch_operations=patch_operation,
+                    container_type="users",
+                )
+                for user_id in user_list
             )
+        )
 
-        logger.info(f"Successfully deleted chat '{chat_id}' in database")
+        logger.info("Successfully deleted chat '%s' in database", chat_id)
+
+    async def _cache_chat(
+        self, keys: ChatKeys, chat_fields: dict[str, Any], chat: Chat
+    ):
+        """Writes a chat to its Redis keys in one round trip.
+
+        Every key of a chat shares a hash slot, so the writes and their
+        expiry are sent as a single transaction.
+
+        Args:
+            keys (ChatKeys): The Redis keys of the chat.
+            chat_fields (dict[str, Any]): Fields stored in the chat hash.
+            chat (Chat): The chat whose users, bots and log are cached.
+        """
+        async with self._redis_service.pipeline() as pipe:
+            pipe.hset(keys.base, mapping=chat_fields)
+            pipe.expire(keys.base, 86400)
+            # SADD needs at least one member
+            if chat.users:
+                pipe.sadd(keys.users, *chat.users)
+                pipe.expire(keys.users, 86400)
+            if chat.bots:
+                pipe.sadd(keys.bots, *chat.bots)
+                pipe.expire(keys.bots, 86400)
+            # Replace any log left behind, so messages are not pushed twice
+            pipe.delete(keys.log)
+            if chat.chat_log:
+                pipe.rpush(
+                    keys.log, *(message.model_dump_json() for message in chat.chat_log)
+                )
+                pipe.expire(keys.log, 86400)
+            await pipe.execute()
+
+    async def _claim_user_chat(self, user_id: str, chat_id: str) -> bool:
+        """Atomically records the chat as the user's current chat.
+
+        The user's chat key is written with SET NX, so two concurrent creates
+        or joins cannot both succeed. The key expires and can be evicted while
+        the user's document still records a chat, so a successful claim is
+        checked against the database, which stays the source of truth. Falls
+        back to only checking the database if Redis is down.
+
+        Args:
+            user_id (str): The user ID of the user entering the chat.
+            chat_id (str): The chat ID of the chat being entered.
+
+        Returns:
+            bool: True if the user was free and is now in the chat, False if
+                the user is already in another chat.
+        """
+        try:
+            claimed = await self._redis_service.set_value_if_absent(
+                key=user_chat_key(user_id), value=chat_id, time=86400
+            )
+        except HTTPException as e:
+            logger.warning("Redis unavailable for claiming user chat: %s", e)
+            return await self.get_user_chat(user_id=user_id) is None
+
+        if not claimed:
+            return False
+
+        # The key was missing, make sure it was not just expired or evicted
+        try:
+            user_data = await self._cosmos_service.get_item(
+                item_id=user_id, partition_key=user_id, container_type="users"
+            )
+        except Exception:
+            await self._release_user_chat(user_id=user_id)
+            raise
+
+        # Any recorded chat counts, even this one, or joining it again would
+        # add the user to the chat document a second time
+        current_chat = user_data.get("chat") if user_data else None
+        if current_chat:
+            logger.info("User chat found in cosmos, adding into redis")
+            try:
+                await self._redis_service.set_value(
+                    key=user_chat_key(user_id), value=current_chat
+                )
+                await self._redis_service.expire(user_chat_key(user_id), 86400)
+            except HTTPException as e:
+                logger.warning("Redis unavailable for setting user chat: %s", e)
+            return False
+
+        return True
+
+    async def _release_user_chat(self, user_id: str):
+        """Best-effort removal of a claim made by _claim_user_chat."""
+        try:
+            await self._redis_service.delete_keys(keys=[user_chat_key(user_id)])
+        except HTTPException as e:
+            logger.warning("Redis unavailable for releasing user chat: %s", e)
 
     async def get_user_chat(self, user_id: str) -> str | None:
         if not user_id:
             raise ValueError("User ID cannot be empty")
+
+        chat_id = None
         try:
-            chat_id = await self._redis_service.get_value(key=f"user:{user_id}:chat")
+            chat_id = await self._redis_service.get_value(key=user_chat_key(user_id))
             if chat_id:
-                await self._redis_service.expire(f"user:{user_id}:chat", 86400)
+                await self._redis_service.expire(user_chat_key(user_id), 86400)
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for getting user chat: {e}")
+            logger.warning("Redis unavailable for getting user chat: %s", e)
 
         if chat_id:
-            logger.info(f"User '{user_id}' chat found in redis: {chat_id}")
+            logger.info("User '%s' chat found in redis: %s", user_id, chat_id)
             return chat_id
 
         logger.warning("User chat not found in redis, checking cosmos")
@@ -381,16 +568,16 @@ class ChatService:
                 logger.info("User chat found in cosmos, adding into redis")
                 try:
                     await self._redis_service.set_value(
-                        key=f"user:{user_id}:chat", value=chat_id
+                        key=user_chat_key(user_id), value=chat_id
                     )
-                    await self._redis_service.expire(f"user:{user_id}:chat", 86400)
+                    await self._redis_service.expire(user_chat_key(user_id), 86400)
                 except HTTPException as e:
-                    logger.warning(f"Redis unavailable for setting user chat: {e}")
+                    logger.warning("Redis unavailable for setting user chat: %s", e)
 
                 return chat_id
 
         logger.warning(
-            f"User chat not found in both redis and cosmos for user '{user_id}'"
+            "User chat not found in both redis and cosmos for user '%s'", user_id
         )
         return None
 
@@ -408,12 +595,14 @@ class ChatService:
         """
         if not chat_id:
             raise ValueError("Chat ID missing on getting user list")
+
+        keys = ChatKeys.for_chat(chat_id)
         try:
-            user_list = await self._redis_service.set_get(key=f"chat:{chat_id}:users")
+            user_list = await self._redis_service.set_get(key=keys.users)
             if user_list is not None:
-                await self._redis_service.expire(f"chat:{chat_id}:users", 86400)
+                await self._redis_service.expire(keys.users, 86400)
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for getting user list: {e}")
+            logger.warning("Redis unavailable for getting user list: %s", e)
 
         if user_list is not None:
             return user_list
@@ -429,17 +618,15 @@ class ChatService:
             if user_list is not None:
                 logger.info("User list found in cosmos, adding into redis")
                 try:
-                    await self._redis_service.set_add(
-                        key=f"chat:{chat_id}:users", values=user_list
-                    )
-                    await self._redis_service.expire(f"chat:{chat_id}:users", 86400)
+                    await self._redis_service.set_add(key=keys.users, values=user_list)
+                    await self._redis_service.expire(keys.users, 86400)
                 except HTTPException as e:
-                    logger.warning(f"Redis unavailable for setting user list: {e}")
+                    logger.warning("Redis unavailable for setting user list: %s", e)
 
                 return user_list
 
         logger.warning(
-            f"User list not found in both redis and cosmos for chat '{chat_id}'"
+            "User list not found in both redis and cosmos for chat '%s'", chat_id
         )
         return None
 
@@ -449,9 +636,8 @@ class ChatService:
         Returns:
             list[dict[str, Any]]: The list of all the chats.
         """
-        query = "SELECT * FROM c"
         chat_list = await self._cosmos_service.get_items_by_query(
-            query=query, container_type="chats"
+            query=QUERY_ALL_ITEMS, container_type="chats"
         )
         return chat_list
 
@@ -470,13 +656,15 @@ class ChatService:
         if not user_id:
             raise ValueError("User ID missing on checking chat")
 
+        keys = ChatKeys.for_chat(chat_id)
+
+        # The chat's user set is the authoritative membership list
         try:
-            chat = await self._redis_service.get_value(key=f"user:{user_id}:chat")
-            if chat:
-                await self._redis_service.expire(f"user:{user_id}:chat", 86400)
-                return chat == chat_id
+            if await self._redis_service.set_is_member(key=keys.users, value=user_id):
+                await self._redis_service.expire(keys.users, 86400)
+                return True
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for check user in chat: {e}")
+            logger.warning("Redis unavailable for check user in chat: %s", e)
 
         chat_data = await self._cosmos_service.get_item(
             item_id=chat_id, partition_key=chat_id, container_type="chats"
@@ -486,7 +674,7 @@ class ChatService:
             user_list = chat_data.get("users")
             return user_id in user_list
 
-        logger.warning(f"User not found in both redis and cosmos for chat '{chat_id}'")
+        logger.warning("User not found in both redis and cosmos for chat '%s'", chat_id)
         return False
 
     async def add_message_to_chat(
@@ -499,27 +687,40 @@ class ChatService:
         if not message:
             raise ValueError("Message missing on adding message")
 
-        chat_message = ChatMessage(sender=user_id, message=message)
-
-        chat = await self.get_chat(chat_id=chat_id)
-        if chat is None:
-            raise HTTPException(status_code=404, detail="Chat not found")
+        keys = ChatKeys.for_chat(chat_id)
 
-        # Verify user is in chat
-        if user_id not in chat.users:
-            raise HTTPException(status_code=403, detail="User not in chat")
+        chat_message = ChatMessage(sender=user_id, message=message)
 
-        chat.chat_log.append(chat_message)
+        # Check membership and append in one round trip. RPUSH adds to the
+        # cached log in place, so concurrent messages cannot overwrite
+        # each other
+        appended = 0
         try:
-            # Convert chat_log to a list of dictionaries for JSON serialization
-            chat_log_dict = [message.model_dump() for message in chat.chat_log]
-            await self._redis_service.set_value(
-                key=f"chat:{chat_id}:log",
-                value=json.dumps(chat_log_dict, default=str),
-            )
-            await self._redis_service.expire(f"chat:{chat_id}:log", 86400)
+            async with self._redis_service.pipeline() as pipe:
+                pipe.eval(
+                    _APPEND_IF_MEMBER,
+                    3,
+                    keys.base,
+                    keys.users,
+                    keys.log,
+                    user_id,
+                    chat_message.model_dump_json(),
+                )
+                pipe.expire(keys.base, 86400)
+                pipe.expire(keys.log, 86400)
+                appended, *_ = await pipe.execute()
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for adding message to chat: {e}")
+            logger.warning("Redis unavailable for adding message to chat: %s", e)
+
+        if appended <= 0:
+            # The chat or its users are not cached, the database decides
+            chat_data = await self._cosmos_service.get_item(
+                item_id=chat_id, partition_key=chat_id, container_type="chats"
+            )
+            if chat_data is None:
+                raise HTTPException(status_code=404, detail="Chat not found")
+            if user_id not in chat_data.get("users", []):
+                raise HTTPException(status_code=403, detail="User not in chat")
 
         patch_operation = [
             {
@@ -536,4 +737,11 @@ class ChatService:
             container_type="chats",
         )
 
+        if appended <= 0:
+            # Drop the partial cache, the next read restores it with this message
+            try:
+                await self._redis_service.delete_keys(keys=[keys.base, keys.log])
+            except HTTPException as e:
+                logger.warning("Redis unavailable for clearing chat cache: %s", e)
+
         return chat_message
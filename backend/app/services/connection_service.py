@@ -1,65 +1,184 @@
+import asyncio
+import json
 import logging
+from collections.abc import Iterable
 
 from fastapi import WebSocket
-from pydantic import validate_call
 
-from app.schemas import BroadcastPayload, PubSubMessage
+from app.schemas import BroadcastPayload
 from app.services.redis_service import RedisService
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of events sent in a single PUBLISH
+PUBLISH_BATCH_SIZE = 100
+
+# Events waiting to be published before publish_event waits for room
+PUBLISH_QUEUE_SIZE = 1000
+
 
 class ConnectionService:
     def __init__(self, redis_service: RedisService):
-        self._active_connections: dict[
-            str, list[WebSocket]
-        ] = {}  # user_id -> websocket
+        # One websocket per user, a newer connection replaces the older one
+        self._active_connections: dict[str, WebSocket] = {}  # user_id -> websocket
         self._redis_service = redis_service
 
         # All servers subscribe to one channel and get channel type in publish payload
         self.pubsub_channel = "global-channel"
 
+        # Events waiting to be published, sent in batches by one publisher task.
+        # Each event carries the future its caller waits on for the result
+        self._publish_queue: asyncio.Queue[tuple[dict, asyncio.Future]] = asyncio.Queue(
+            maxsize=PUBLISH_QUEUE_SIZE
+        )
+        self._publish_task: asyncio.Task | None = None
+
     async def connect(self, websocket: WebSocket, user_id: str):
-        logger.info(f"Added user '{user_id}' to  in active connections")
+        logger.info("Added user '%s' to  in active connections", user_id)
         self._active_connections[user_id] = websocket
 
-    def disconnect(self, user_id: str):
-        if user_id in self._active_connections:
-            del self._active_connections[user_id]
-            logger.info(f"Deleted user '{user_id}' in active connections")
+    def disconnect(self, user_id: str, websocket: WebSocket | None = None):
+        active_websocket = self._active_connections.get(user_id)
+        if active_websocket is None:
+            logger.warning("User '%s' not found in active connections", user_id)
+        elif websocket is not None and active_websocket is not websocket:
+            # An older socket closing must not drop the user's newer connection
+            logger.info("Stale websocket closed for user '%s'", user_id)
         else:
-            logger.warning(f"User '{user_id}' not found in active connections")
+            del self._active_connections[user_id]
+            logger.info("Deleted user '%s' in active connections", user_id)
 
     async def publish_event(
-        self, channel: str, user_list: set[str], message_data: dict
+        self, channel: str, user_list: Iterable[str], message_data: dict
     ):
-        payload = BroadcastPayload(user_list=user_list, message=message_data)
-        message = PubSubMessage(channel=channel, payload=payload)
-        message_dict = message.model_dump(mode="json")
-        await self._redis_service.publish_message(
-            channel_name=self.pubsub_channel, message=message_dict
-        )
-        logger.info(f"Published message to channel {channel}: {message_data}")
+        """Publishes an event for every server to deliver to the given users.
+
+        The event is queued and shares a PUBLISH with the events queued at the
+        same time. Waits until it has been published, and for room in the
+        queue when it is full. The event is built as a plain dict, it is
+        validated once as a PubSubMessage by the listener that receives it.
+
+        Args:
+            channel (str): Event type used by the listener to pick a handler.
+            user_list (Iterable[str]): Unique users the message is delivered to.
+            message_data (dict): JSON-compatible message to deliver.
+
+        Raises:
+            ValueError: If the user list or the message is empty.
+            Exception: Whatever the publish of the event's batch raised.
+        """
+        # Reject here what the listener would drop, so callers still see it
+        user_list = tuple(user_list)
+        if not user_list:
+            raise ValueError(f"User list was empty while publishing to {channel}")
+        if not message_data:
+            raise ValueError(f"Message was empty while publishing to {channel}")
+
+        message_dict = {
+            "channel": channel,
+            "payload": {"user_list": user_list, "message": message_data},
+        }
 
-    @validate_call  # validate payload
-    async def broadcast(self, payload: BroadcastPayload):
-        message = payload.message
+        if self._publish_task is None or self._publish_task.done():
+            self._publish_task = asyncio.create_task(self._publish_batches())
+
+        published = asyncio.get_running_loop().create_future()
+        await self._publish_queue.put((message_dict, published))
+        await published
+        logger.info("Published message to channel %s: %s", channel, message_data)
+
+    async def _publish_batches(self):
+        """Publishes queued events, one PUBLISH per batch.
+
+        Waits for the first event, then takes whatever else was queued in the
+        meantime up to PUBLISH_BATCH_SIZE. A lone event is sent right away,
+        while bursts share a single round trip. Every event's future gets the
+        result of its batch's publish.
+        """
+        while True:
+            batch = [await self._publish_queue.get()]
+            while len(batch) < PUBLISH_BATCH_SIZE and not self._publish_queue.empty():
+                batch.append(self._publish_queue.get_nowait())
+
+            # A lone event keeps the single envelope format, which listeners
+            # of the previous release still expect
+            messages = [message for message, _ in batch]
+            message = messages[0] if len(messages) == 1 else {"batch": messages}
+            try:
+                await self._redis_service.publish_message(
+                    channel_name=self.pubsub_channel, message=message
+                )
+            except Exception as e:
+                logger.exception("Failed to publish batch of %s events", len(batch))
+                for _, published in batch:
+                    if not published.done():
+                        published.set_exception(e)
+            else:
+                for _, published in batch:
+                    if not published.done():
+                        published.set_result(None)
+            finally:
+                for _, published in batch:
+                    # Only left pending if the publisher itself was cancelled
+                    if not published.done():
+                        published.cancel()
+                    self._publish_queue.task_done()
+
+    async def flush(self):
+        """Waits until every queued event has been published."""
+        await self._publish_queue.join()
+
+    async def close(self):
+        """Publishes pending events and stops the publisher task."""
+        if self._publish_task is None:
+            return
+
+        await self.flush()
+        self._publish_task.cancel()
+        try:
+            await self._publish_task
+        except asyncio.CancelledError:
+            pass
+        self._publish_task = None
+
+    async def broadcast(self, payload: BroadcastPayload | dict):
+        # Payloads from the listener are already validated models, only raw
+        # dicts need to go through validation
+        if not isinstance(payload, BroadcastPayload):
+            payload = BroadcastPayload.model_validate(payload)
+
+        # Encode once for the whole broadcast instead of once per connection
+        message = json.dumps(payload.message, separators=(",", ":"), ensure_ascii=False)
         user_list = payload.user_list
 
         active_user_list = self.get_active_users_from_list(user_list=user_list)
 
-        for user_id in active_user_list:
-            await self.send_message(message=message, user_id=user_id)
+        # Send to every connection concurrently so one slow socket does not
+        # delay delivery to the rest of the list
+        results = await asyncio.gather(
+            *(
+                self.send_message(message=message, user_id=user_id)
+                for user_id in active_user_list
+            ),
+            return_exceptions=True,
+        )
+        for user_id, result in zip(active_user_list, results, strict=True):
+            if isinstance(result, Exception):
+                logger.error("Failed to send message to user '%s': %s", user_id, result)
 
-    async def send_message(self, message: dict, user_id: str):
-        if user_id in self._active_connections:
-            await self._active_connections[user_id].send_json(message)
+    async def send_message(self, message: dict | str, user_id: str):
+        # One lookup instead of a membership test followed by an index
+        websocket = self._active_connections.get(user_id)
+        if websocket is not None:
+            if isinstance(message, str):
+                # Already serialized JSON text
+                await websocket.send_text(message)
+            else:
+                await websocket.send_json(message)
         else:
-            logger.info(f"User '{user_id}' not found in active connections")
-
-    def get_active_users_from_list(self, user_list: list[str]) -> list[str]:
-        active_list = []
-        for user in user_list:
-            if user in self._active_connections:
-                active_list.append(user)
-        return active_list
+            logger.info("User '%s' not found in active connections", user_id)
+
+    def get_active_users_from_list(self, user_list: Iterable[str]) -> list[str]:
+        # Local binding skips the attribute lookup per user, order is preserved
+        active_connections = self._active_connections
+        return [user for user in user_list if user in active_connections]
@@ -1,53 +1,146 @@
+import asyncio
+import base64
+import binascii
 import logging
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from enum import Enum
 from typing import Any
 
+import aiohttp
+from azure.core.pipeline.transport import AioHttpTransport
 from azure.cosmos.aio import CosmosClient
-from azure.cosmos.exceptions import CosmosHttpResponseError, CosmosResourceNotFoundError
-from azure.identity.aio import DefaultAzureCredential
+from azure.cosmos.exceptions import (
+    CosmosBatchOperationError,
+    CosmosHttpResponseError,
+    CosmosResourceNotFoundError,
+)
 from fastapi import HTTPException, status
 
 from app.config import settings
+from app.credentials import get_azure_credential
 
 logger = logging.getLogger(__name__)
 
+# Items requested per query page, larger pages mean fewer round trips
+QUERY_PAGE_SIZE = 500
+
+# Point reads in flight at once for a single get_items call
+GET_ITEMS_CONCURRENCY = 32
+
+# HTTP connection pool shared by all Cosmos requests of the process
+CONNECTION_POOL_SIZE = 256
+CONNECTIONS_PER_HOST = 128
+# Below the 4 minute idle timeout of Azure load balancers
+KEEPALIVE_TIMEOUT = 120
+# Seconds a resolved Cosmos endpoint address is reused
+DNS_CACHE_TTL = 300
+
+# Fixed query texts, values are always bound as parameters so every call of
+# a query shape sends identical SQL and reuses the same query plan
+QUERY_ALL_ITEMS = "SELECT * FROM c"
+QUERY_USER_BY_EMAIL = "SELECT * FROM c WHERE c.email_lower = @email"
+QUERY_USER_BY_USERNAME = "SELECT * FROM c WHERE c.username_lower = @username"
+QUERY_USER_BY_IDENTIFIER = (
+    "SELECT * FROM c WHERE c.email_lower = @identifier"
+    " or c.username_lower = @identifier"
+)
+
+# Cosmos DB limit on operations in a single transactional batch
+BATCH_MAX_OPERATIONS = 100
+
+# Cosmos DB limit on operations in a single patch request
+PATCH_MAX_OPERATIONS = 10
+
+# Partition keys written at once for a single bulk_upsert call
+BULK_UPSERT_CONCURRENCY = 64
+
+
+class ContainerType(str, Enum):
+    """Cosmos containers used by the app.
+
+    Members are strings, so callers may pass either a member or its value.
+    """
+
+    USERS = "users"
+    ROOMS = "rooms"
+    CHATS = "chats"
+
+
+def _create_session() -> aiohttp.ClientSession:
+    """Creates the aiohttp session used by every Cosmos request of the process.
+
+    Must be called on the running event loop, which the session binds to.
+    Session options match the ones azure-core uses for its own sessions.
+    """
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(
+            limit=CONNECTION_POOL_SIZE,
+            limit_per_host=CONNECTIONS_PER_HOST,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=DNS_CACHE_TTL,
+        ),
+        cookie_jar=aiohttp.DummyCookieJar(),
+        trust_env=True,
+        auto_decompress=False,
+    )
+
 
 class CosmosService:
     def __init__(self):
         self.client: CosmosClient | None = None
+        self._session: aiohttp.ClientSession | None = None
 
         if settings.COSMOS_ENDPOINT:
             # Use managed identity if no connection string
             logger.info("Initializing Cosmos Service Client with Azure Credentials")
-            credential = DefaultAzureCredential()
-            self.client = CosmosClient(
-                url=settings.COSMOS_ENDPOINT, credential=credential
-            )
+            self._credential = get_azure_credential()
         else:
             raise ValueError(
                 "Database configuration missing. Set either COSMOS_CONNECTION_STRING or COSMOS_ENDPOINT"
             )
 
-        if not self.client:
-            raise ConnectionError("Failed to connect to CosmosClient")
+        # Container type -> client, filled in by _connect on first use.
+        # Members hash like their values, so plain strings find the same entry
+        self._containers: dict[str, Any] = {}
+
+    def _connect(self):
+        """Creates the client and its connection pool on first use.
+
+        The service may be built outside the event loop, so the aiohttp
+        session is only created once a database call runs on the loop.
+        """
+        self._session = _create_session()
+        self.client = CosmosClient(
+            url=settings.COSMOS_ENDPOINT,
+            credential=self._credential,
+            # The service owns the session and closes it in close()
+            transport=AioHttpTransport(session=self._session, session_owner=False),
+            # Throttled (429) requests are left to the SDK's own retries, which
+            # wait the server's x-ms-retry-after-ms for up to 9 attempts or 30 s
+        )
 
         db_client = self.client.get_database_client(settings.COSMOS_DATABASE_NAME)
-        self.users_container_client = db_client.get_container_client("users")
-        self.rooms_container_client = db_client.get_container_client("rooms")
-        self.chats_container_client = db_client.get_container_client("chats")
+        self._containers = {
+            container_type: db_client.get_container_client(container_type.value)
+            for container_type in ContainerType
+        }
 
     async def close(self):
         logger.info("Closing Cosmos client session")
-        await self.client.close()
-
-    def get_container(self, container_type: str):
-        if container_type == "users":
-            return self.users_container_client
-        elif container_type == "rooms":
-            return self.rooms_container_client
-        elif container_type == "chats":
-            return self.chats_container_client
-        else:
+        if self.client is not None:
+            await self.client.close()
+        if self._session is not None:
+            await self._session.close()
+
+    def get_container(self, container_type: ContainerType | str):
+        if self.client is None:
+            self._connect()
+
+        container = self._containers.get(container_type)
+        if container is None:
             raise ValueError(f"Container type '{container_type}' does not exist")
+        return container
 
     # Database access functions
     async def add_item(self, item: dict[str, Any], container_type: str):
@@ -55,18 +148,21 @@ class CosmosService:
             raise ValueError("Invalid Item")
 
         container = self.get_container(container_type)
-        logger.info(f"Adding item to container '{container.id}': '{item.get('id')}'")
+        logger.info("Adding item to container '%s': '%s'", container.id, item.get("id"))
         try:
-            await container.create_item(body=item)
+            # The written document is not used, skip sending it back
+            await container.create_item(body=item, no_response=True)
         except CosmosHttpResponseError as e:
-            logger.error(f"Cosmos DB error adding item '{item.get('id')}': {e.message}")
+            logger.error(
+                "Cosmos DB error adding item '%s': %s", item.get("id"), e.message
+            )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="A database error occurred during the patch operation",
             ) from e
         except Exception as e:
             logger.error(
-                f"Failed to add item '{item.get('id')}' to '{container.id}': {e}"
+                "Failed to add item '%s' to '%s': %s", item.get("id"), container.id, e
             )
             raise
 
@@ -76,52 +172,160 @@ class CosmosService:
 
         container = self.get_container(container_type)
         logger.info(
-            f"Geting item from container '{container.id}' with item id '{item_id}' and partition key '{partition_key}'"
+            "Geting item from container '%s' with item id '%s' and partition key '%s'",
+            container.id,
+            item_id,
+            partition_key,
         )
         try:
             item = await container.read_item(item=item_id, partition_key=partition_key)
             return item
         except CosmosResourceNotFoundError:
             logger.warning(
-                f"Item '{item_id}' with partition key '{partition_key}' not found in container '{container.id}'"
+                "Item '%s' with partition key '%s' not found in container '%s'",
+                item_id,
+                partition_key,
+                container.id,
             )
             return None
         except CosmosHttpResponseError as e:
-            logger.error(f"Cosmos DB error getting item '{item_id}': {e.message}")
+            logger.error("Cosmos DB error getting item '%s': %s", item_id, e.message)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="A database error occurred during the get operation",
             ) from e
         except Exception as e:
             logger.error(
-                f"Failed to get item '{item_id}' with partition key '{partition_key}' from '{container.id}': {e}"
+                "Failed to get item '%s' with partition key '%s' from '%s': %s",
+                item_id,
+                partition_key,
+                container.id,
+                e,
             )
             raise
 
+    async def exists(
+        self, item_id: str, partition_key: str, container_type: str
+    ) -> bool:
+        """Check whether an item exists with a point read.
+
+        A point read costs about 1 RU, use it instead of a query filtering on
+        c.id, which costs more and may fan out across partitions.
+
+        Args:
+            item_id (str): ID of the item.
+            partition_key (str): Partition key of the item.
+            container_type (str): Container holding the item.
+
+        Returns:
+            bool: True if the item exists.
+        """
+        if not item_id or not partition_key:
+            raise ValueError("Item ID and partition key cannot be empty")
+
+        container = self.get_container(container_type)
+        try:
+            await container.read_item(item=item_id, partition_key=partition_key)
+            return True
+        except CosmosResourceNotFoundError:
+            return False
+        except CosmosHttpResponseError as e:
+            logger.error("Cosmos DB error checking item '%s': %s", item_id, e.message)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="A database error occurred during the get operation",
+            ) from e
+
+    async def get_items(
+        self, keys: list[tuple[str, str]], container_type: str
+    ) -> list[dict[str, Any] | None]:
+        """Point-read several items concurrently.
+
+        Args:
+            keys (list[tuple[str, str]]): (item ID, partition key) pairs to read.
+            container_type (str): Container holding the items.
+
+        Returns:
+            list[Optional[dict[str, Any]]]: The items in the same order as the
+                keys, None for items that do not exist.
+        """
+        semaphore = asyncio.Semaphore(GET_ITEMS_CONCURRENCY)
+
+        async def read(item_id: str, partition_key: str) -> dict[str, Any] | None:
+            async with semaphore:
+                return await self.get_item(
+                    item_id=item_id,
+                    partition_key=partition_key,
+                    container_type=container_type,
+                )
+
+        return list(
+            await asyncio.gather(
+                *(read(item_id, partition_key) for item_id, partition_key in keys)
+            )
+        )
+
     # Getting items using a SQL Query
     async def get_items_by_query(
         self,
         query: str,
         container_type: str,
         parameters: list[dict[str, Any]] | None = None,
+        partition_key: str | None = None,
     ) -> list[dict[str, Any]]:
+        items = [
+            item
+            async for item in self.stream_items_by_query(
+                query=query,
+                container_type=container_type,
+                parameters=parameters,
+                partition_key=partition_key,
+            )
+        ]
+        logger.info("Query returned %s items", len(items))
+        return items
+
+    async def stream_items_by_query(
+        self,
+        query: str,
+        container_type: str,
+        parameters: list[dict[str, Any]] | None = None,
+        max_item_count: int = QUERY_PAGE_SIZE,
+        partition_key: str | None = None,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Yield query results as the pages arrive.
+
+        Only the current page is held in memory, and the first items are
+        available before the rest of the query has run.
+
+        Args:
+            query (str): SQL query text.
+            container_type (str): Container to query.
+            parameters (list[dict[str, Any]], optional): Query parameters.
+            max_item_count (int): Items requested per page.
+            partition_key (str, optional): Partition to query. Without it the
+                query fans out to every partition.
+
+        Yields:
+            dict[str, Any]: Each item matching the query.
+
+        Raises:
+            ValueError: If the query is empty.
+            HTTPException: If the query is invalid or fails.
+        """
         if not query:
             raise ValueError("Query string cannot be empty")
 
         container = self.get_container(container_type)
-        logger.info(f"Querying items in container '{container.id}': {query}")
+        logger.info("Querying items in container '%s': %s", container.id, query)
         try:
-            items = [
-                item
-                async for item in container.query_items(
-                    query=query, parameters=parameters
-                )
-            ]
-            logger.info(f"Query returned {len(items)} items")
-            return items
+            async for item in container.query_items(
+                **self._query_options(query, parameters, max_item_count, partition_key)
+            ):
+                yield item
         except CosmosHttpResponseError as e:
             logger.error(
-                f"Cosmos DB query failed with status {e.status_code}: {e.message}"
+                "Cosmos DB query failed with status %s: %s", e.status_code, e.message
             )
             if e.status_code == 400:
                 raise HTTPException(
@@ -134,20 +338,122 @@ class CosmosService:
                     detail=f"A database error occurred while executing the query: {query}",
                 ) from e
         except Exception as e:
-            logger.error(f"Failed to execute query {query}: {e}")
+            logger.error("Failed to execute query %s: %s", query, e)
             raise
 
+    @staticmethod
+    def _query_options(
+        query: str,
+        parameters: list[dict[str, Any]] | None,
+        max_item_count: int,
+        partition_key: str | None,
+    ) -> dict[str, Any]:
+        options = {
+            "query": query,
+            "parameters": parameters,
+            "max_item_count": max_item_count,
+        }
+        # Scoping to one partition avoids a fan-out to every partition
+        if partition_key is not None:
+            options["partition_key"] = partition_key
+        return options
+
+    async def paginate_query(
+        self,
+        query: str,
+        container_type: str,
+        page_size: int,
+        continuation_token: str | None = None,
+        parameters: list[dict[str, Any]] | None = None,
+        partition_key: str | None = None,
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """Fetch one page of query results.
+
+        Pages are driven by the continuation token of the SDK, so every page
+        costs the same no matter how deep it is. Do not page with
+        OFFSET/LIMIT, which rescans all skipped items on every request.
+
+        Args:
+            query (str): SQL query text.
+            container_type (str): Container to query.
+            page_size (int): Maximum items in the page.
+            continuation_token (str, optional): Cursor returned with the
+                previous page, None for the first page.
+            parameters (list[dict[str, Any]], optional): Query parameters.
+            partition_key (str, optional): Partition to query.
+
+        Returns:
+            tuple[list[dict[str, Any]], Optional[str]]: The items of the page
+                and the cursor for the next one, None on the last page.
+
+        Raises:
+            ValueError: If the query is empty.
+            HTTPException: If the cursor or the query is invalid, or the
+                query fails.
+        """
+        if not query:
+            raise ValueError("Query string cannot be empty")
+
+        sdk_token = None
+        if continuation_token:
+            try:
+                sdk_token = base64.b64decode(
+                    continuation_token, altchars=b"-_", validate=True
+                ).decode()
+            except (binascii.Error, UnicodeDecodeError) as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid continuation token",
+                ) from e
+
+        container = self.get_container(container_type)
+        logger.info("Querying page of items in container '%s': %s", container.id, query)
+        try:
+            pages = container.query_items(
+                **self._query_options(query, parameters, page_size, partition_key)
+            ).by_page(sdk_token)
+            page = await anext(pages, None)
+            items = [item async for item in page] if page is not None else []
+        except CosmosHttpResponseError as e:
+            logger.error(
+                "Cosmos DB query failed with status %s: %s", e.status_code, e.message
+            )
+            if e.status_code == 400:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Invalid query syntax: {e.message}",
+                ) from e
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"A database error occurred while executing the query: {query}",
+            ) from e
+
+        next_token = pages.continuation_token
+        if next_token:
+            next_token = base64.urlsafe_b64encode(next_token.encode()).decode()
+        return items, next_token
+
     async def update_item(self, item: dict[str, Any], container_type: str):
+        """Replace a whole item, creating it if it does not exist.
+
+        This sends the full document. When only some fields change, use
+        patch_fields or patch_item, which send just the changes and cost
+        fewer request units.
+        """
         if not item:
             raise ValueError("Invalid Item")
 
         container = self.get_container(container_type)
-        logger.info(f"Updating item to container '{container.id}': '{item.get('id')}'")
+        logger.info(
+            "Updating item to container '%s': '%s'", container.id, item.get("id")
+        )
         try:
-            await container.upsert_item(body=item)
+            await container.upsert_item(body=item, no_response=True)
         except CosmosResourceNotFoundError as e:
             logger.warning(
-                f"Item '{item.get('id')}' not found in container '{container.id}' for patching"
+                "Item '%s' not found in container '%s' for patching",
+                item.get("id"),
+                container.id,
             )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -155,7 +461,7 @@ class CosmosService:
             ) from e
         except CosmosHttpResponseError as e:
             logger.error(
-                f"Cosmos DB error updating item '{item.get('id')}': {e.message}"
+                "Cosmos DB error updating item '%s': %s", item.get("id"), e.message
             )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -163,10 +469,86 @@ class CosmosService:
             ) from e
         except Exception as e:
             logger.error(
-                f"Failed to update item '{item.get('id')}' to '{container.id}': {e}"
+                "Failed to update item '%s' to '%s': %s",
+                item.get("id"),
+                container.id,
+                e,
             )
             raise
 
+    async def bulk_upsert(
+        self,
+        items: list[dict[str, Any]],
+        container_type: str,
+        partition_key_field: str = "id",
+    ):
+        """Upsert many items with as few requests as possible.
+
+        Items are grouped by partition key. A group with several items is sent
+        as transactional batches of up to BATCH_MAX_OPERATIONS upserts, a lone
+        item as a plain upsert. Groups are written concurrently.
+
+        Args:
+            items (list[dict[str, Any]]): Full items to create or replace.
+            container_type (str): Container holding the items.
+            partition_key_field (str): Item field holding the partition key.
+
+        Raises:
+            ValueError: If an item has no partition key.
+            HTTPException: If a write fails.
+        """
+        groups: defaultdict[Any, list[dict[str, Any]]] = defaultdict(list)
+        for item in items:
+            partition_key = item.get(partition_key_field)
+            if partition_key is None:
+                raise ValueError(
+                    f"Item is missing partition key '{partition_key_field}'"
+                )
+            groups[partition_key].append(item)
+
+        if not groups:
+            return
+
+        container = self.get_container(container_type)
+        logger.info(
+            "Upserting %s items in %s partitions to container '%s'",
+            len(items),
+            len(groups),
+            container.id,
+        )
+        semaphore = asyncio.Semaphore(BULK_UPSERT_CONCURRENCY)
+
+        async def write(partition_key: Any, group: list[dict[str, Any]]):
+            async with semaphore:
+                if len(group) == 1:
+                    await container.upsert_item(body=group[0], no_response=True)
+                    return
+
+                for start in range(0, len(group), BATCH_MAX_OPERATIONS):
+                    await container.execute_item_batch(
+                        batch_operations=[
+                            ("upsert", (item,))
+                            for item in group[start : start + BATCH_MAX_OPERATIONS]
+                        ],
+                        partition_key=partition_key,
+                    )
+
+        try:
+            await asyncio.gather(
+                *(
+                    write(partition_key, group)
+                    for partition_key, group in groups.items()
+                )
+            )
+        except (CosmosBatchOperationError, CosmosHttpResponseError) as e:
+            logger.error(
+                "Cosmos DB error during bulk upsert to '%s': %s", container.id, e
+            )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="A database error occurred during the bulk upsert operation",
+            ) from e
+
     async def patch_item(
         self,
         item_id: str,
@@ -178,63 +560,109 @@ class CosmosService:
             raise ValueError("Item ID and partition key cannot be empty")
 
         container = self.get_container(container_type)
-        logger.info(f"Patching item '{item_id}' from container '{container.id}")
+        logger.info("Patching item '%s' from container '%s", item_id, container.id)
         try:
             await container.patch_item(
                 item=item_id,
                 partition_key=partition_key,
                 patch_operations=patch_operations,
+                no_response=True,
             )
         except CosmosResourceNotFoundError as e:
             logger.warning(
-                f"Item '{item_id}' not found in container '{container.id}' for patching"
+                "Item '%s' not found in container '%s' for patching",
+                item_id,
+                container.id,
             )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Item with id '{item_id}' not found",
             ) from e
         except CosmosHttpResponseError as e:
-            logger.error(f"Cosmos DB error patching item '{item_id}': {e.message}")
+            logger.error("Cosmos DB error patching item '%s': %s", item_id, e.message)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="A database error occurred during the patch operation",
             ) from e
         except Exception as e:
             logger.critical(
-                f"An unexpected error occurred while patching item '{item_id}': {e}"
+                "An unexpected error occurred while patching item '%s': %s", item_id, e
             )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="An unexpected internal error occurred",
             ) from e
 
+    async def patch_fields(
+        self,
+        item_id: str,
+        partition_key: str,
+        fields: dict[str, Any],
+        container_type: str,
+    ):
+        """Set top-level fields of an item with a partial update.
+
+        Builds one "set" operation per field and sends them with patch_item,
+        so only the changed values go over the wire. More than
+        PATCH_MAX_OPERATIONS fields are sent as several patches in order,
+        which are not applied atomically together.
+
+        Args:
+            item_id (str): ID of the item to update.
+            partition_key (str): Partition key of the item.
+            fields (dict[str, Any]): Field names mapped to their new values.
+            container_type (str): Container holding the item.
+
+        Raises:
+            ValueError: If no fields are given.
+        """
+        if not fields:
+            raise ValueError("Fields to patch cannot be empty")
+
+        patch_operations = [
+            {"op": "set", "path": f"/{field}", "value": value}
+            for field, value in fields.items()
+        ]
+        for start in range(0, len(patch_operations), PATCH_MAX_OPERATIONS):
+            await self.patch_item(
+                item_id=item_id,
+                partition_key=partition_key,
+                patch_operations=patch_operations[start : start + PATCH_MAX_OPERATIONS],
+                container_type=container_type,
+            )
+
     async def delete_item(self, item_id: str, partition_key: str, container_type: str):
         if not item_id or not partition_key:
             raise ValueError("Item ID and partition key cannot be empty")
 
         container = self.get_container(container_type)
         logger.info(
-            f"Deleting item from container '{container.id}': '{item_id}' with partition key '{partition_key}'"
+            "Deleting item from container '%s': '%s' with partition key '%s'",
+            container.id,
+            item_id,
+            partition_key,
         )
         try:
             await container.delete_item(item=item_id, partition_key=partition_key)
         except CosmosResourceNotFoundError as e:
             logger.warning(
-                f"Item '{item_id}' not found in container '{container.id}' for deleting"
+                "Item '%s' not found in container '%s' for deleting",
+                item_id,
+                container.id,
             )
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Item with id '{item_id}' not found",
             ) from e
         except CosmosHttpResponseError as e:
-            logger.error(f"Cosmos DB error deleting item '{item_id}': {e.message}")
+            logger.error("Cosmos DB error deleting item '%s': %s", item_id, e.message)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="A database error occurred during the delete operation",
             ) from e
         except Exception as e:
             logger.critical(
-                f"An unexpected error occurred while patching item '{item_id}': {e}"
+                "An unexpected error occurred while patching item '%s': %s", item_id, e
             )
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
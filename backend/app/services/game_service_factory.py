@@ -1,26 +1,42 @@
-from app.services.games.chess.chess_game import ChessSystem
+import importlib
+import threading
+
 from app.services.games.game_interface import GameSystem
-from app.services.games.lands.lands import LandsSystem
-from app.services.games.ulttt.ultimate_tic_tac_toe import UltimateTicTacToeSystem
 
 
 class GameServiceFactory:
+    __slots__ = ("_instances", "_lock", "_service_map")
+
     def __init__(self):
-        self._service_map = {
-            "chess": ChessSystem,
-            "ultimate_tic_tac_toe": UltimateTicTacToeSystem,
-            "lands": LandsSystem,
+        # "module:Class" paths are imported on first use, so a process only
+        # loads the game engines it actually serves
+        self._service_map: dict[str, str] = {
+            "chess": "app.services.games.chess.chess_game:ChessSystem",
+            "ultimate_tic_tac_toe": (
+                "app.services.games.ulttt.ultimate_tic_tac_toe:UltimateTicTacToeSystem"
+            ),
+            "lands": "app.services.games.lands.lands:LandsSystem",
         }
         self._instances = {}
+        # Guards construction, get_service may also run in threadpool workers
+        self._lock = threading.Lock()
 
     def get_service(self, game_type: str) -> GameSystem:
-        if game_type in self._instances:
-            return self._instances[game_type]
+        # Single lookup on the hot path, every game action goes through here
+        instance = self._instances.get(game_type)
+        if instance is not None:
+            return instance
 
-        service_class = self._service_map.get(game_type)
-        if not service_class:
+        service_path = self._service_map.get(game_type)
+        if not service_path:
             raise ValueError(f"Unknown game type: {game_type}")
 
-        instance = service_class()
-        self._instances[game_type] = instance
+        with self._lock:
+            # Another caller may have built it while this one waited
+            instance = self._instances.get(game_type)
+            if instance is None:
+                module_name, class_name = service_path.split(":")
+                module = importlib.import_module(module_name)
+                instance = getattr(module, class_name)()
+                self._instances[game_type] = instance
         return instance
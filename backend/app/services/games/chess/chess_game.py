@@ -1,4 +1,10 @@
+import operator
 import random
+import sys
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any
 
 import chess
@@ -13,6 +19,110 @@ from .chess_interface import (
 )
 
 
+def _as_state(state: ChessState | dict[str, Any]) -> ChessState:
+    """Validates raw state from storage, model instances pass straight through"""
+    if isinstance(state, ChessState):
+        return state
+    return ChessState.model_validate(state)
+
+
+def _as_action(action: ChessAction | dict[str, Any]) -> ChessAction:
+    """Validates a raw client action, model instances pass straight through"""
+    if isinstance(action, ChessAction):
+        return action
+    return ChessAction.model_validate(action)
+
+
+@lru_cache(maxsize=4096)
+def _board_for(fen: str) -> chess.Board:
+    """Parses a FEN once, callers must copy the cached board before use."""
+    return chess.Board(fen=fen)
+
+
+def _current_player_index(board: chess.Board) -> int:
+    """White is always player_ids[0], so the side to move gives the index"""
+    return 0 if board.turn == chess.WHITE else 1
+
+
+@lru_cache(maxsize=2048)
+def _legal_ucis(fen: str) -> tuple[str, ...]:
+    """Lists the legal moves of a position in UCI, cached by FEN."""
+    return tuple(move.uci() for move in _board_for(fen).legal_moves)
+
+
+@lru_cache(maxsize=1024)
+def _representation_for(fen: str) -> Mapping[str, Any]:
+    """Describes a position, cached by FEN so it is read-only for callers"""
+    board = _board_for(fen)
+    return MappingProxyType({
+        "fen": board.fen(),
+        "ascii": str(board),
+        "turn": "white" if board.turn else "black",
+        "castling_rights": MappingProxyType({
+            "white_kingside": board.has_kingside_castling_rights(chess.WHITE),
+            "white_queenside": board.has_queenside_castling_rights(chess.WHITE),
+            "black_kingside": board.has_kingside_castling_rights(chess.BLACK),
+            "black_queenside": board.has_queenside_castling_rights(chess.BLACK),
+        }),
+        "en_passant": (
+            chess.square_name(board.ep_square) if board.ep_square is not None else None
+        ),
+        "halfmove_clock": board.halfmove_clock,
+        "fullmove_number": board.fullmove_number,
+        "is_check": board.is_check(),
+        "is_checkmate": board.is_checkmate(),
+        "is_stalemate": board.is_stalemate(),
+    })
+
+
+def _move_action(uci: str) -> ChessAction:
+    """Builds a move action for a UCI string python-chess already produced"""
+    return ChessAction.model_construct(
+        type="MAKE_MOVE", payload=ChessMovePayload.model_construct(move=uci)
+    )
+
+
+class LegalChessActions(Sequence[ChessAction]):
+    """Actions available in a position: RESIGN followed by every legal move.
+
+    Actions are only built when read, so len() and membership checks work
+    on the UCI strings without creating a model per move.
+    """
+
+    __slots__ = ("_ucis",)
+
+    def __init__(self, ucis: tuple[str, ...]):
+        self._ucis = ucis
+
+    def __len__(self) -> int:
+        return len(self._ucis) + 1
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        index = operator.index(index)
+        if index < 0:
+            index += len(self)
+        if index == 0:
+            return ChessAction.model_construct(type="RESIGN", payload=None)
+        if not 0 < index < len(self):
+            raise IndexError("action index out of range")
+        return _move_action(self._ucis[index - 1])
+
+    def __iter__(self):
+        yield ChessAction.model_construct(type="RESIGN", payload=None)
+        for uci in self._ucis:
+            yield _move_action(uci)
+
+    def __contains__(self, action: object) -> bool:
+        if not isinstance(action, ChessAction):
+            return False
+        if action.type == "RESIGN":
+            return True
+        return action.payload is not None and action.payload.move in self._ucis
+
+
 class ChessSystem(GameSystem[ChessState, ChessAction]):
     @validate_call
     def initialize_game(self, player_ids: list[str]) -> ChessState:
@@ -23,136 +133,134 @@ class ChessSystem(GameSystem[ChessState, ChessAction]):
         return ChessState(
             player_ids=selected_players,
             turn=1,
-            meta={
-                "current_player_index": 0,
-            },
+            meta={},
         )
 
     def _create_board_from_state(self, state: ChessState) -> chess.Board:
         """Creates a chess board from current state"""
-        return chess.Board(fen=state.board_fen)
+        # Copying a parsed board is cheaper than parsing the FEN again
+        return _board_for(state.board_fen).copy(stack=False)
+
+    @contextmanager
+    def _borrow_board(self, state: ChessState) -> Iterator[chess.Board]:
+        """Lends the cached board for a position without copying it.
+
+        Callers may push moves to look ahead, every push is popped again on
+        exit so the cached board is left as it was. Nothing may await while
+        the board is borrowed.
+        """
+        board = _board_for(state.board_fen)
+        depth = len(board.move_stack)
+        try:
+            yield board
+        finally:
+            while len(board.move_stack) > depth:
+                board.pop()
 
-    @validate_call  # validate that ChessState and ChessAction
     def make_action(
         self, state: ChessState, player_id: str, action: ChessAction
     ) -> ChessState:
-        self.is_action_valid(state, player_id, action)
+        state = _as_state(state)
+        action = _as_action(action)
 
+        # One board serves both validation and the move itself
         board = self._create_board_from_state(state=state)
+        self._validate(board, state, player_id, action)
 
         if action.type == "RESIGN":
-            current_player_index = state.meta["current_player_index"]
             winner = "white" if board.turn == chess.BLACK else "black"
             game_result = f"{winner}_wins"
             new_state = state.model_copy(
                 update={
                     "game_result": game_result,
                     "finished": True,
-                    "meta": {
-                        **state.meta,
-                    },
                 },
-                deep=True,
             )
             return new_state
 
-        move = chess.Move.from_uci(action.payload.move)
-        board.push(move)
-
-        new_move_history = state.move_history + [action.payload.move]
+        # Moves and positions repeat across games, interning shares one copy
+        uci = sys.intern(action.payload.move)
+        board.push(chess.Move.from_uci(uci))
 
-        current_player_index = state.meta["current_player_index"]
-        next_player_index = 1 - current_player_index
+        new_move_history = (*state.move_history, uci)
 
-        game_result = None
-        if board.is_checkmate():
-            winner = "white" if board.turn == chess.BLACK else "black"
-            game_result = f"{winner}_wins"
-        elif (
-            board.is_stalemate()
-            or board.is_insufficient_material()
-            or board.is_seventyfive_moves()
-            or board.is_fivefold_repetition()
-        ):
+        # outcome() covers checkmate and every automatic draw while
+        # generating the legal moves at most once
+        outcome = board.outcome()
+        if outcome is None:
+            game_result = None
+        elif outcome.winner is None:
             game_result = "draw"
+        else:
+            winner = "white" if outcome.winner == chess.WHITE else "black"
+            game_result = f"{winner}_wins"
 
-        meta = {
-            "current_player_index": next_player_index,
-        }
-
-        new_state = ChessState(
+        # The board came from pushing a legal move, so the FEN is already
+        # known to be valid; skip the validator's second parse of it.
+        new_state = ChessState.model_construct(
             finished=game_result is not None,
             game_id=state.game_id,
             player_ids=state.player_ids,
             turn=state.turn + 1,
-            meta=meta,
-            board_fen=board.fen(),
+            meta=state.meta,
+            board_fen=sys.intern(board.fen()),
             game_result=game_result,
             move_history=new_move_history,
         )
 
         return new_state
 
-    @validate_call  # validate ChessState
-    def get_valid_actions(self, state: ChessState, player_id: str) -> list[ChessAction]:
-        board = self._create_board_from_state(state=state)
+    def get_valid_actions(
+        self, state: ChessState, player_id: str
+    ) -> Sequence[ChessAction]:
+        state = _as_state(state)
 
         if state.finished:
             return []
 
-        current_player_index = state.meta["current_player_index"]
-        if state.player_ids[current_player_index] != player_id:
+        # The cached board is only read for whose turn it is
+        board = _board_for(state.board_fen)
+        if state.player_ids[_current_player_index(board)] != player_id:
             return []
 
-        valid_moves = [ChessAction(type="RESIGN", payload=None)]
-        for move in board.legal_moves:
-            valid_moves.append(ChessAction(payload=ChessMovePayload(move=move.uci())))
-
-        return valid_moves
+        return LegalChessActions(_legal_ucis(state.board_fen))
 
-    @validate_call
     def is_action_valid(
         self,
         state: ChessState,
         player_id: str,
         action: ChessAction,
     ) -> bool:
+        state = _as_state(state)
+        action = _as_action(action)
+        # Checking legality leaves the board untouched, so no copy is needed
+        with self._borrow_board(state) as board:
+            self._validate(board, state, player_id, action)
+        return True
+
+    def _validate(
+        self,
+        board: chess.Board,
+        state: ChessState,
+        player_id: str,
+        action: ChessAction,
+    ):
+        """Raises ValueError if the action cannot be played on the given board"""
         if state.finished:
             raise ValueError("Game is already finished.")
 
-        current_player_index = state.meta["current_player_index"]
-        if state.player_ids[current_player_index] != player_id:
+        if state.player_ids[_current_player_index(board)] != player_id:
             raise ValueError("It's not your turn.")
 
         if action.type == "MAKE_MOVE":
             try:
-                board = self._create_board_from_state(state=state)
                 move = chess.Move.from_uci(action.payload.move)
-                if move not in board.legal_moves:
+                if not board.is_legal(move):
                     raise ValueError("Move is invalid.")
             except InvalidMoveError as e:
                 raise ValueError("Move is invalid.") from e
 
-        return True
-
-    @validate_call
-    def get_board_representation(self, state: ChessState) -> dict[str, Any]:
-        """Returns a dictionary representation of the current board state"""
-        board = self._create_board_from_state(state=state)
-        return {
-            "fen": board.fen(),
-            "ascii": str(board),
-            "turn": "white" if board.turn else "black",
-            "castling_rights": {
-                "white_kingside": board.has_kingside_castling_rights(chess.WHITE),
-                "white_queenside": board.has_queenside_castling_rights(chess.WHITE),
-                "black_kingside": board.has_kingside_castling_rights(chess.BLACK),
-                "black_queenside": board.has_queenside_castling_rights(chess.BLACK),
-            },
-            "en_passant": board.ep_square if board.ep_square else None,
-            "halfmove_clock": board.halfmove_clock,
-            "fullmove_number": board.fullmove_number,
-            "is_check": board.is_check(),
-            "is_checkmate": board.is_checkmate(),
-            "is_stalemate": board.is_stalemate(),
-        }
+    def get_board_representation(self, state: ChessState) -> Mapping[str, Any]:
+        """Returns a read-only representation of the current board state"""
+        state = _as_state(state)
+        return _representation_for(state.board_fen)
@@ -18,7 +18,7 @@ class ChessState(GameState):
         default="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
     )
     game_result: str | None = None
-    move_history: list[str] = Field(default_factory=list)
+    move_history: tuple[str, ...] = ()
 
     @model_validator(mode="after")
     def validate_chess_state(self) -> "ChessState":
@@ -33,19 +33,6 @@ class ChessState(GameState):
         if self.game_result is not None and not self.finished:
             raise ValueError("If game_result is set, finished must be True")
 
-        # White's turn corresponds to current_player_index 0, Black's to 1
-        is_white_turn = board.turn == chess.WHITE
-        current_player_index = self.meta.get("current_player_index")
-
-        if is_white_turn and current_player_index != 0:
-            raise ValueError(
-                "FEN indicates white's turn, but current_player_index is not 0"
-            )
-        if not is_white_turn and current_player_index != 1:
-            raise ValueError(
-                "FEN indicates black's turn, but current_player_index is not 1"
-            )
-
         return self
 
 
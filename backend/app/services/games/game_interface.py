@@ -1,5 +1,6 @@
 import uuid
 from abc import ABC, abstractmethod
+from collections.abc import Sequence
 from typing import Annotated, Any, Generic, TypeVar
 
 from pydantic import BaseModel, Field, computed_field, model_validator
@@ -7,44 +8,48 @@ from pydantic import BaseModel, Field, computed_field, model_validator
 
 # --- Generic Phase ---
 class Phase(BaseModel):
-    current: str  # Current phase of the game
+    current_index: int = 0  # Index of the current phase in available_phases
     available_phases: Annotated[
-        list[str], Field(min_length=1)
-    ]  # List of all available phases
+        tuple[str, ...], Field(min_length=1)
+    ]  # All available phases, immutable so copies can share them
 
     @model_validator(mode="before")
     @classmethod
-    def set_current_if_missing(cls, values: dict) -> dict:
-        if "current" not in values or not values["current"]:
-            if "available_phases" in values and values["available_phases"]:
-                # Set 'current' to the first available phase
-                values["current"] = values["available_phases"][0]
-            else:
-                raise ValueError(
-                    "'current' is missing and cannot be defaulted from 'available_phases'"
-                )
+    def set_index_from_current(cls, values: dict) -> dict:
+        # Phases may be given by name, as states stored before the index were
+        if isinstance(values, dict) and "current_index" not in values:
+            current = values.get("current")
+            if current:
+                phases = values.get("available_phases") or []
+                if current not in phases:
+                    raise ValueError(
+                        f"Current phase '{current}' is not in available phases {phases}"
+                    )
+                values = {**values, "current_index": phases.index(current)}
         return values
 
     @model_validator(mode="after")
     def validate_current_index(self):
-        if self.current not in self.available_phases:
+        if not 0 <= self.current_index < len(self.available_phases):
             raise ValueError(
-                f"Current phase '{self.current}' is not in available phases {self.available_phases}"
+                f"Current phase index {self.current_index} is not in available phases {self.available_phases}"
             )
         return self
 
-    # Index of the current phase in available_phases
+    # Current phase of the game
     @computed_field
-    def _current_index(self) -> int:
-        return self.available_phases.index(self.current)
+    @property
+    def current(self) -> str:
+        return self.available_phases[self.current_index]
 
     def next_phase(self):
-        # Calculate the next index, looping back to 0 if at the end
-        next_index = (self._current_index + 1) % len(self.available_phases)
+        return self.advance(1)
 
-        return self.model_copy(
-            update={"current": self.available_phases[next_index]}, deep=True
-        )
+    def advance(self, steps: int):
+        # Calculate the index steps ahead, looping back to 0 if at the end
+        next_index = (self.current_index + steps) % len(self.available_phases)
+
+        return self.model_copy(update={"current_index": next_index})
 
 
 # --- Type Variables for Components ---
@@ -101,7 +106,9 @@ class GameSystem(ABC, Generic[StateType, ActionType]):
         pass
 
     @abstractmethod
-    def get_valid_actions(self, state: StateType, player_id: str) -> list[ActionType]:
+    def get_valid_actions(
+        self, state: StateType, player_id: str
+    ) -> Sequence[ActionType]:
         """Returns all valid actions for a given player"""
         pass
 
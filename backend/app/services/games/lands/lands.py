@@ -1,5 +1,7 @@
 import logging
 import random
+from functools import cache
+from itertools import combinations_with_replacement, compress
 
 from pydantic import validate_call
 
@@ -10,6 +12,55 @@ from .lands_interface import LandsAction, LandsPayload, LandsPrivateState, Lands
 logger = logging.getLogger(__name__)
 
 
+def _build_constant_actions() -> dict[tuple[str, int | None], LandsAction]:
+    actions = {
+        ("RESIGN", None): LandsAction.model_construct(type="RESIGN", payload=None)
+    }
+    for action_type, targets in (
+        ("PLAY_ENERGY", range(5)),
+        ("COUNTER", (0, 1)),
+        ("CHOOSE_TARGET", (None, *range(5))),
+    ):
+        for target in targets:
+            actions[action_type, target] = LandsAction.model_construct(
+                type=action_type, payload=LandsPayload.model_construct(target=target)
+            )
+    return actions
+
+
+# Actions with a fixed shape are built once and shared, callers must not mutate them
+_ACTIONS = _build_constant_actions()
+
+
+def _present(counts: list[int]) -> list[int]:
+    """Lists the card types with a non-zero count."""
+    return list(compress(range(len(counts)), counts))
+
+
+def _expand(hand: list[int]) -> list[int]:
+    """Lists each card in a hand of counts, in card type order."""
+    cards = []
+    for card_type, count in enumerate(hand):
+        cards.extend([card_type] * count)
+    return cards
+
+
+@cache
+def _darkness_targets(hand: tuple[int, ...]) -> tuple[tuple[int, ...], ...]:
+    """
+    Lists every combination of 3 cards, duplicates included, that fits in a hand.
+
+    Only 3 cards are revealed, so callers cap each count at 3 and the cache holds
+    at most 4**5 hands.
+    """
+    unique_cards = _present(hand)
+    return tuple(
+        combo
+        for combo in combinations_with_replacement(unique_cards, 3)
+        if all(combo.count(card) <= hand[card] for card in set(combo))
+    )
+
+
 class LandsSystem(GameSystem[LandsState, LandsAction]):
     """
     Implements the game logic for Lands.
@@ -20,7 +71,8 @@ class LandsSystem(GameSystem[LandsState, LandsAction]):
         if len(player_ids) != 2:
             raise ValueError("Lands requires exactly 2 players.")
 
-        new_state = LandsState(
+        # Everything below is built here from validated player ids, skip validation
+        new_state = LandsState.model_construct(
             boards={pid: [0, 0, 0, 0, 0] for pid in player_ids},
             discard={pid: [0, 0, 0, 0, 0] for pid in player_ids},
             player_ids=player_ids,
@@ -30,9 +82,9 @@ class LandsSystem(GameSystem[LandsState, LandsAction]):
                 "countered": 0,
                 "curr_player_index": 0,
             },
-            private_state=PrivateStates(
+            private_state=PrivateStates.model_construct(
                 states={
-                    pid: LandsPrivateState(
+                    pid: LandsPrivateState.model_construct(
                         hand=[0, 0, 0, 0, 0], deck=self._initialize_deck()
                     )
                     for pid in player_ids
@@ -49,61 +101,63 @@ class LandsSystem(GameSystem[LandsState, LandsAction]):
     def make_action(
         self, state: LandsState, player_id: str, action: LandsAction
     ) -> LandsState:
-        self.is_action_valid(state, player_id, action)
+        # Arguments are already validated, skip is_action_valid's validate_call
+        if not self._allows(state, player_id, action):
+            raise ValueError("Invalid action.")
 
-        new_state = state.model_copy(deep=True)
+        # Look up the players once, branches only read these from the old state
+        main_idx = state.meta["main_player_index"]
+        curr_idx = state.meta["curr_player_index"]
+        main_id = state.player_ids[main_idx]
+
+        # Each branch copies only the cards its action can change, and sets plain
+        # fields in the same copy. Resolving a card ends the turn and the next
+        # player draws, so it touches both players.
         match action.type:
             case "RESIGN":
-                new_state.meta["winner"] = new_state.player_ids[
-                    1 - new_state.meta["curr_player_index"]
-                ]
-                new_state.finished = True
+                new_state = state._clone_for(finished=True)
+                new_state.meta["winner"] = state.player_ids[1 - curr_idx]
             case "PLAY_ENERGY":
                 card_type = action.payload.target
-                new_state.private_state.states[player_id].hand[card_type] -= 1
-                new_state.pending_card = card_type
-                new_state.meta["curr_player_index"] = (
-                    1 - new_state.meta["curr_player_index"]
+                new_state = state._clone_for(
+                    (player_id,),
+                    pending_card=card_type,
+                    phase=state.phase.next_phase(),
                 )
-                new_state.phase = new_state.phase.next_phase()
+                new_state.private_state.states[player_id].hand[card_type] -= 1
+                new_state.meta["curr_player_index"] = 1 - curr_idx
             case "COUNTER":
                 # Counter change stopped
                 if action.payload.target == 0:
                     # Move to resolution phase
-                    new_state.phase = new_state.phase.next_phase()
+                    new_state = state._clone_for(
+                        state.player_ids, phase=state.phase.next_phase()
+                    )
                     if (
-                        new_state.meta["countered"] % 2 == 0
+                        state.meta["countered"] % 2 == 0
                     ):  # Not countered or countered the counter
                         # Card goes to the board
-                        main_player_id = state.player_ids[
-                            state.meta["main_player_index"]
-                        ]
-                        new_state.meta["curr_player_index"] = new_state.meta[
-                            "main_player_index"
-                        ]
+                        new_state.meta["curr_player_index"] = main_idx
                         card_type = state.pending_card
                         if card_type is not None:
-                            new_state.boards[main_player_id][card_type] += 1
+                            new_state.boards[main_id][card_type] += 1
 
                         # Check for the winner
-                        new_state = self._check_win_condition(new_state, main_player_id)
+                        new_state = self._check_win_condition(new_state, main_id)
                         if new_state.meta.get("winner"):
                             return new_state
 
                         new_state = self._resolve_after_counter_fail(new_state)
                     else:
                         # Counter went through, so main player loses their card
-                        main_player_id = state.player_ids[
-                            state.meta["main_player_index"]
-                        ]
                         card_type = state.pending_card
                         if card_type is not None:
-                            new_state.discard[main_player_id][card_type] += 1
-                        new_state = self._end_turn(new_state)
-                        new_state = self._start_turn(new_state)
+                            new_state.discard[main_id][card_type] += 1
+                        new_state = self._advance_turn(new_state)
                 else:  # Countering
+                    new_state = state._clone_for((player_id,))
                     # If it is an initial counter
-                    if new_state.meta["countered"] == 0:
+                    if state.meta["countered"] == 0:
                         pending_card = state.pending_card
                         if pending_card is not None:
                             new_state.private_state.states[player_id].hand[
@@ -120,12 +174,12 @@ class LandsSystem(GameSystem[LandsState, LandsAction]):
                         new_state.discard[player_id][lv.WATER] += 2
                         new_state.meta["countered"] += 1
                     # Switch the turn. The other player can counter again
-                    new_state.meta["curr_player_index"] = (
-                        1 - new_state.meta["curr_player_index"]
-                    )
+                    new_state.meta["curr_player_index"] = 1 - curr_idx
             case "CHOOSE_TARGET":  # Resolving the effect of a card
                 new_state = self._resolve_target_choice(
-                    new_state, player_id, action.payload.target
+                    state._clone_for(state.player_ids),
+                    player_id,
+                    action.payload.target,
                 )
         return new_state
 
@@ -140,7 +194,7 @@ class LandsSystem(GameSystem[LandsState, LandsAction]):
             return valid_actions
 
         # Always possible to resign for the current player
-        valid_actions.append(LandsAction(type="RESIGN", payload=None))
+        valid_actions.append(_ACTIONS["RESIGN", None])
 
         match state.phase.current:
             case "MAIN_PHASE":
@@ -149,58 +203,22 @@ class LandsSystem(GameSystem[LandsState, LandsAction]):
                     state.private_state.states[player_id].hand
                 ):
                     if count > 0:
-                        valid_actions.append(
-                            LandsAction(
-                                type="PLAY_ENERGY",
-                                payload=LandsPayload(target=card_type),
-                            )
-                        )
+                        valid_actions.append(_ACTIONS["PLAY_ENERGY", card_type])
             case "COUNTER_PHASE":
                 # player can choose to counter or not
-                valid_actions.append(
-                    LandsAction(type="COUNTER", payload=LandsPayload(target=0))
-                )  # Don't counter
+                valid_actions.append(_ACTIONS["COUNTER", 0])  # Don't counter
 
-                # Check if can counter
-                pending_card = state.pending_card
-
-                if pending_card is not None:
-                    hand = state.private_state.states[player_id].hand
-                    # If it is the first counter
-                    if state.meta["countered"] == 0:
-                        # Need 1 water and 1 matching card
-                        if hand[lv.WATER] > 0 and hand[pending_card] > 0:
-                            # Special case: if pending card is water, need 2 water cards
-                            if pending_card == lv.WATER and hand[lv.WATER] < 2:
-                                pass
-                            else:
-                                valid_actions.append(
-                                    LandsAction(
-                                        type="COUNTER", payload=LandsPayload(target=1)
-                                    )
-                                )  # Counter
-                    else:  # If it is a counter to a counter, need two water cards
-                        if hand[lv.WATER] > 1:
-                            valid_actions.append(
-                                LandsAction(
-                                    type="COUNTER", payload=LandsPayload(target=1)
-                                )
-                            )  # Counter
+                if self._can_counter(state, player_id):
+                    valid_actions.append(_ACTIONS["COUNTER", 1])  # Counter
             case "RESOLUTION_PHASE":
                 # player can only choose a target from the selection
                 if state.selection:
-                    if (
-                        state.pending_card == lv.DARKNESS
-                        and state.meta["curr_player_index"]
-                        == 1 - state.meta["main_player_index"]
-                    ):
+                    if self._is_darkness_reveal(state):
                         # If it is opponent's turn, they have to choose three cards from their hand to reveal
                         hand = state.private_state.states[player_id].hand
                         if sum(hand) <= 3:
                             # If they have 3 or fewer cards, they have to reveal all of them
-                            entire_hand = []
-                            for card_type, count in enumerate(hand):
-                                entire_hand.extend([card_type] * count)
+                            entire_hand = _expand(hand)
                             valid_actions.append(
                                 LandsAction(
                                     type="CHOOSE_TARGET",
@@ -209,49 +227,21 @@ class LandsSystem(GameSystem[LandsState, LandsAction]):
                             )
                         # Otherwise, they can choose any combination of 3 cards from their hand, including duplicates
                         else:
-                            from itertools import combinations_with_replacement
-
-                            unique_cards = [
-                                card_type
-                                for card_type, count in enumerate(hand)
-                                if count > 0
-                            ]
-                            possible_combinations = set(
-                                combinations_with_replacement(unique_cards, 3)
-                            )
-                            for combo in possible_combinations:
-                                # Check if the player has enough cards to make this combination
-                                temp_hand = hand.copy()
-                                valid_combo = True
-                                for card in combo:
-                                    if temp_hand[card] > 0:
-                                        temp_hand[card] -= 1
-                                    else:
-                                        valid_combo = False
-                                        break
-                                if valid_combo:
-                                    valid_actions.append(
-                                        LandsAction(
-                                            type="CHOOSE_TARGET",
-                                            payload=LandsPayload(target=list(combo)),
-                                        )
+                            capped_hand = tuple(min(count, 3) for count in hand)
+                            for combo in _darkness_targets(capped_hand):
+                                valid_actions.append(
+                                    LandsAction(
+                                        type="CHOOSE_TARGET",
+                                        payload=LandsPayload(target=list(combo)),
                                     )
+                                )
                     else:
                         for target in state.selection:
-                            valid_actions.append(
-                                LandsAction(
-                                    type="CHOOSE_TARGET",
-                                    payload=LandsPayload(target=target),
-                                )
-                            )
+                            valid_actions.append(_ACTIONS["CHOOSE_TARGET", target])
                 else:
                     # Edge case: no valid targets (e.g. opponent has no cards on board for fire)
                     # Allow player to choose no target, which will effectively skip the effect
-                    valid_actions.append(
-                        LandsAction(
-                            type="CHOOSE_TARGET", payload=LandsPayload(target=None)
-                        )
-                    )
+                    valid_actions.append(_ACTIONS["CHOOSE_TARGET", None])
 
         return valid_actions
 
@@ -259,97 +249,150 @@ class LandsSystem(GameSystem[LandsState, LandsAction]):
     def is_action_valid(
         self, state: LandsState, player_id: str, action: LandsAction
     ) -> bool:
-        valid_actions = self.get_valid_actions(state, player_id)
-        if action not in valid_actions:
+        # Same rules as get_valid_actions, checked for this one action only
+        if not self._allows(state, player_id, action):
             raise ValueError("Invalid action.")
         return True
 
     # --- Helper methods ---
 
+    # Whether get_valid_actions would list the action, without building the list
+    def _allows(self, state: LandsState, player_id: str, action: LandsAction) -> bool:
+        if (
+            state.finished
+            or player_id != state.player_ids[state.meta["curr_player_index"]]
+        ):
+            return False
+
+        payload = action.payload
+        if action.type == "RESIGN":
+            return payload is None
+        if payload is None:
+            return False
+
+        target = payload.target
+        hand = state.private_state.states[player_id].hand
+        match action.type:
+            case "PLAY_ENERGY":
+                return (
+                    state.phase.current == "MAIN_PHASE"
+                    and isinstance(target, int)
+                    and 0 <= target < len(hand)
+                    and hand[target] > 0
+                )
+            case "COUNTER":
+                if state.phase.current != "COUNTER_PHASE":
+                    return False
+                if target == 0:
+                    return True
+                return target == 1 and self._can_counter(state, player_id)
+            case "CHOOSE_TARGET":
+                if state.phase.current != "RESOLUTION_PHASE":
+                    return False
+                if not state.selection:
+                    return target is None
+                if self._is_darkness_reveal(state):
+                    if not isinstance(target, list):
+                        return False
+                    if sum(hand) <= 3:
+                        return target == _expand(hand)
+                    capped_hand = tuple(min(count, 3) for count in hand)
+                    return tuple(target) in _darkness_targets(capped_hand)
+                return isinstance(target, int) and target in state.selection
+        return False
+
+    # Whether the player has the cards to counter the pending card
+    def _can_counter(self, state: LandsState, player_id: str) -> bool:
+        pending_card = state.pending_card
+        if pending_card is None:
+            return False
+
+        hand = state.private_state.states[player_id].hand
+        # If it is a counter to a counter, need two water cards
+        if state.meta["countered"] != 0:
+            return hand[lv.WATER] > 1
+
+        # Need 1 water and 1 matching card
+        if hand[lv.WATER] == 0 or hand[pending_card] == 0:
+            return False
+        # Special case: if pending card is water, need 2 water cards
+        return pending_card != lv.WATER or hand[lv.WATER] >= 2
+
+    # Whether the opponent has to pick cards to reveal for a darkness card
+    def _is_darkness_reveal(self, state: LandsState) -> bool:
+        return (
+            state.pending_card == lv.DARKNESS
+            and state.meta["curr_player_index"] == 1 - state.meta["main_player_index"]
+        )
+
     # Handles the turn logic after a counter has been fizzled
     def _resolve_after_counter_fail(self, state: LandsState) -> LandsState:
-        main_player_id = state.player_ids[state.meta["main_player_index"]]
-        opponent_id = state.player_ids[1 - state.meta["main_player_index"]]
+        main_idx = state.meta["main_player_index"]
+        main_player_id = state.player_ids[main_idx]
+        opponent_id = state.player_ids[1 - main_idx]
         card_type = state.pending_card
 
         match card_type:
             case lv.GRASS:
-                state.meta["curr_player_index"] = state.meta["main_player_index"]
-                state.selection = [
-                    i
-                    for i, count in enumerate(state.discard[main_player_id])
-                    if count > 0
-                ]
+                state.meta["curr_player_index"] = main_idx
+                state.selection = _present(state.discard[main_player_id])
             case lv.LIGHTNING:
                 state = self._draw_cards(state, main_player_id, 1)
-                state = self._end_turn(state)
-                state = self._start_turn(state)
+                state = self._advance_turn(state)
             case lv.FIRE:
-                state.meta["curr_player_index"] = state.meta["main_player_index"]
-                state.selection = [
-                    i for i, count in enumerate(state.boards[opponent_id]) if count > 0
-                ]
+                state.meta["curr_player_index"] = main_idx
+                state.selection = _present(state.boards[opponent_id])
             case lv.DARKNESS:
                 # Opponent has to choose a card from their hand if they have any
-                state.meta["curr_player_index"] = 1 - state.meta["main_player_index"]
+                state.meta["curr_player_index"] = 1 - main_idx
                 # Put copy of opponent's hand into selection
                 state.selection = list(state.private_state.states[opponent_id].hand)
             case lv.WATER:
-                state.meta["curr_player_index"] = state.meta["main_player_index"]
+                state.meta["curr_player_index"] = main_idx
                 state.selection = [0, 1]  # 0: keep on top, 1: move to bottom
-                state.private_state.states[
-                    main_player_id
-                ].top_card = state.private_state.states[main_player_id].deck[0]
+                main_private = state.private_state.states[main_player_id]
+                main_private.top_card = main_private.deck[0]
         return state
 
     def _check_win_condition(self, state: LandsState, player_id: str) -> LandsState:
         board = state.boards[player_id]
 
-        # Check for 5 of the same type of energy
-        if any(count >= 5 for count in board):
+        # 5 of the same type of energy, or 1 of each type of energy
+        if max(board) >= 5 or min(board) >= 1:
             state.meta["winner"] = player_id
             state.finished = True
-            return state
 
-        # Check for 1 of each type of energy
-        if all(count >= 1 for count in board):
-            state.meta["winner"] = player_id
-            state.finished = True
-            return state
-
-        return state
-
-    # Start a draw phase for the main player
-    def _start_turn(self, state: LandsState) -> LandsState:
-        state.turn += 1
-
-        # Draw one Card, but not on the first turn
-        if state.turn > 1:
-            player_id = state.player_ids[state.meta["main_player_index"]]
-            state = self._draw_cards(state, player_id, 1)
-
-        # Move to Main Phase
-        state.phase = state.phase.next_phase()
         return state
 
-    def _end_turn(self, state: LandsState) -> LandsState:
+    # End the turn and start the next one, through the draw phase to the main phase
+    def _advance_turn(self, state: LandsState) -> LandsState:
         # switch main player
-        state.meta["main_player_index"] = 1 - state.meta["main_player_index"]
-        state.meta["curr_player_index"] = state.meta["main_player_index"]
+        main_idx = 1 - state.meta["main_player_index"]
+        state.meta["main_player_index"] = main_idx
+        state.meta["curr_player_index"] = main_idx
 
         # Reset turn-specific variables
         state.meta["countered"] = 0
         state.pending_card = None
         state.selection = None
-        state.phase = state.phase.next_phase()  # Back to draw phase
 
+        state.turn += 1
+
+        # Draw one Card, but not on the first turn
+        if state.turn > 1:
+            state = self._draw_cards(state, state.player_ids[main_idx], 1)
+
+        # Skip over the draw phase to the main phase in one step
+        state.phase = state.phase.advance(2)
         return state
 
     def _resolve_target_choice(
         self, state: LandsState, player_id: str, target: int
     ) -> LandsState:
         active_player_id = player_id
-        opponent_id = state.player_ids[1 - state.meta["curr_player_index"]]
+        main_idx = state.meta["main_player_index"]
+        curr_idx = state.meta["curr_player_index"]
+        opponent_id = state.player_ids[1 - curr_idx]
         card_type = state.pending_card
 
         match card_type:
@@ -357,43 +400,32 @@ class LandsSystem(GameSystem[LandsState, LandsAction]):
                 if target is not None:
                     state.discard[active_player_id][target] -= 1
                     state.private_state.states[active_player_id].hand[target] += 1
-                state = self._end_turn(state)
-                state = self._start_turn(state)
+                state = self._advance_turn(state)
             case lv.FIRE:
                 if target is not None:
                     state.boards[opponent_id][target] -= 1
                     state.discard[opponent_id][target] += 1
-                state = self._end_turn(state)
-                state = self._start_turn(state)
+                state = self._advance_turn(state)
             case lv.DARKNESS:
                 # If it is opponent's turn, target is a chosen selection of cards from their hand to reveal
-                if (
-                    state.meta["curr_player_index"]
-                    == 1 - state.meta["main_player_index"]
-                ):
+                if curr_idx == 1 - main_idx:
                     state.selection = list(target)
-                    state.meta["curr_player_index"] = state.meta["main_player_index"]
+                    state.meta["curr_player_index"] = main_idx
                 else:  # If it is main player's turn, target is a card to discard from opponent's hand
                     if target is not None:
                         state.private_state.states[opponent_id].hand[target] -= 1
                         state.discard[opponent_id][target] += 1
-                    state = self._end_turn(state)
-                    state = self._start_turn(state)
+                    state = self._advance_turn(state)
             case lv.WATER:
                 if target is not None:
                     # target is either 0 (keep it top) or 1 (move to bottom)
+                    active_private = state.private_state.states[active_player_id]
                     if target == 1:  # Move to bottom
-                        top_card = state.private_state.states[
-                            active_player_id
-                        ].deck.pop(0)
-                        state.private_state.states[active_player_id].deck.append(
-                            top_card
-                        )
+                        active_private.deck.append(active_private.deck.pop(0))
                     # Hide top card
-                    state.private_state.states[active_player_id].top_card = None
+                    active_private.top_card = None
 
-                state = self._end_turn(state)
-                state = self._start_turn(state)
+                state = self._advance_turn(state)
         return state
 
     # Create a deck with 5 of each type of card (0-4)
@@ -406,19 +438,22 @@ class LandsSystem(GameSystem[LandsState, LandsAction]):
     def _draw_cards(
         self, state: LandsState, player_id: str, num_cards: int
     ) -> LandsState:
-        drawn_cards = []
-        for _ in range(num_cards):
-            if not state.private_state.states[player_id].deck:
-                state = self._reshuffle_discard_into_deck(state, player_id)
-                if not state.private_state.states[player_id].deck:
-                    # No cards left to draw
-                    break
-
-            card = state.private_state.states[player_id].deck.pop(0)
-            drawn_cards.append(card)
-
+        # Take the cards off the top in one slice instead of popping each one
+        deck = state.private_state.states[player_id].deck
+        drawn_cards = deck[:num_cards]
+        del deck[:num_cards]
+
+        if len(drawn_cards) < num_cards:
+            # Deck ran out, draw the rest from the reshuffled discard pile
+            state = self._reshuffle_discard_into_deck(state, player_id)
+            deck = state.private_state.states[player_id].deck
+            missing = num_cards - len(drawn_cards)
+            drawn_cards += deck[:missing]
+            del deck[:missing]
+
+        hand = state.private_state.states[player_id].hand
         for card in drawn_cards:
-            state.private_state.states[player_id].hand[card] += 1
+            hand[card] += 1
 
         return state
 
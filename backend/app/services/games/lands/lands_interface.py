@@ -1,4 +1,6 @@
-from typing import Literal
+from collections.abc import Iterable
+from copy import deepcopy
+from typing import Any, Literal
 
 from pydantic import BaseModel, Field
 
@@ -60,6 +62,69 @@ class LandsState(GameState):
     # cards in player's discard when a grass is successfully played
     selection: list[int] | None = None
 
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> "LandsState":
+        """
+        Deep copies only the parts of the state that are changed in place.
+
+        player_ids and the phase are only ever replaced, so the copy shares them.
+        One memo is passed through so shared references are copied once.
+        """
+        memo = {} if memo is None else memo
+        copied = self.model_copy(
+            update={
+                "meta": deepcopy(self.meta, memo),
+                "boards": deepcopy(self.boards, memo),
+                "discard": deepcopy(self.discard, memo),
+                "private_state": deepcopy(self.private_state, memo),
+                "selection": deepcopy(self.selection, memo),
+            }
+        )
+        memo[id(self)] = copied
+        return copied
+
+    def _clone_for(self, players: Iterable[str] = (), **updates: Any) -> "LandsState":
+        """
+        Copies the state for an action that only changes the given players' cards.
+
+        The listed players get their own board, discard, hand and deck. Everyone
+        else's are shared with this state, so they must not be mutated in place.
+        meta is always copied, other fields are only ever replaced, never mutated.
+        Any updates are set on the copy in the same pass.
+        """
+        players = set(players)
+        states = self.private_state.states
+        return self.model_copy(
+            update={
+                "meta": dict(self.meta),
+                "boards": {
+                    pid: cards[:] if pid in players else cards
+                    for pid, cards in self.boards.items()
+                },
+                "discard": {
+                    pid: cards[:] if pid in players else cards
+                    for pid, cards in self.discard.items()
+                },
+                "private_state": self.private_state.model_copy(
+                    update={
+                        "states": {
+                            pid: (
+                                private.model_copy(
+                                    update={
+                                        "hand": private.hand[:],
+                                        "deck": private.deck[:],
+                                    }
+                                )
+                                if pid in players
+                                else private
+                            )
+                            for pid, private in states.items()
+                        }
+                    }
+                ),
+                **updates,
+            }
+        )
+
 
 class LandsPayload(BaseModel):
     """
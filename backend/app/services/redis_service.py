@@ -12,6 +12,7 @@ from typing import Any
 
 import redis.asyncio as aioredis
 from fastapi import HTTPException
+from redis.asyncio.client import Pipeline
 from redis.exceptions import ConnectionError, RedisError
 
 from app.config import settings
@@ -42,12 +43,19 @@ class RedisService:
         self.r = None
         if settings.REDIS_CONNECTION_URL:
             try:
-                self.r = aioredis.from_url(
-                    settings.REDIS_CONNECTION_URL, decode_responses=True
+                # One bounded pool for the whole process, callers wait for a
+                # free connection instead of failing when it is exhausted
+                pool = aioredis.BlockingConnectionPool.from_url(
+                    settings.REDIS_CONNECTION_URL,
+                    max_connections=settings.REDIS_MAX_CONNECTIONS,
+                    timeout=settings.REDIS_POOL_TIMEOUT,
+                    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+                    decode_responses=True,
                 )
+                self.r = aioredis.Redis.from_pool(pool)
                 logger.info("Initializing Redis Client")
             except ConnectionError as e:
-                logger.error(f"Failed to connect to Redis: {e}")
+                logger.error("Failed to connect to Redis: %s", e)
                 self.r = None
         else:
             logger.error("Redis Configuration missing. Set the REDIS_CONNECTION_URL")
@@ -72,10 +80,11 @@ class RedisService:
         self._check_client()
 
         try:
-            message_str = json.dumps(message)
+            # Compact encoding, the payload is only read by other servers
+            message_str = json.dumps(message, separators=(",", ":"), ensure_ascii=False)
             await self.r.publish(channel=channel_name, message=message_str)
         except RedisError as e:
-            logger.error(f"Redis Error publishing to channel '{channel_name}': {e}")
+            logger.error("Redis Error publishing to channel '%s': %s", channel_name, e)
 
     async def set_value(self, key: str, value):
         """Store a key-value pair in Redis.
@@ -95,7 +104,32 @@ class RedisService:
         try:
             await self.r.set(key, value)
         except RedisError as e:
-            logger.error(f"Redis Error getting using key '{key}': {e}")
+            logger.error("Redis Error getting using key '%s': %s", key, e)
+            raise
+
+    async def set_value_if_absent(self, key: str, value, time: int) -> bool:
+        """Store a key-value pair in Redis only if the key does not exist yet.
+
+        Uses a single atomic SET with NX and EX, so concurrent callers racing
+        for the same key cannot both succeed.
+
+        Args:
+            key (str): The Redis key to store the value under.
+            value: The value to store. Can be string, number, or other Redis-compatible type.
+            time (int): Expiration time in seconds.
+
+        Raises:
+            RedisError: If there's an error storing the value in Redis.
+
+        Returns:
+            bool: True if the value was stored, False if the key already existed.
+        """
+        self._check_client()
+
+        try:
+            return bool(await self.r.set(key, value, ex=time, nx=True))
+        except RedisError as e:
+            logger.error("Redis Error setting if absent using key '%s': %s", key, e)
             raise
 
     async def get_value(self, key: str) -> Any:
@@ -118,7 +152,7 @@ class RedisService:
             value = await self.r.get(key)
             return value
         except RedisError as e:
-            logger.error(f"Redis Error getting using key '{key}': {e}")
+            logger.error("Redis Error getting using key '%s': %s", key, e)
             raise
 
     async def dict_add(self, key: str, mapping: dict):
@@ -139,7 +173,7 @@ class RedisService:
         try:
             await self.r.hset(key, mapping=mapping)
         except RedisError as e:
-            logger.error(f"Redis Error writing dict using key '{key}': {e}")
+            logger.error("Redis Error writing dict using key '%s': %s", key, e)
             raise
 
     async def dict_get_all(self, key: str) -> dict | None:
@@ -160,7 +194,7 @@ class RedisService:
             mapping = await self.r.hgetall(key)
             return mapping
         except RedisError as e:
-            logger.error(f"Redis Error reading dict using key '{key}': {e}")
+            logger.error("Redis Error reading dict using key '%s': %s", key, e)
             raise
 
     async def set_add(self, key: str, values: set | list):
@@ -178,7 +212,7 @@ class RedisService:
         try:
             await self.r.sadd(key, *values)
         except RedisError as e:
-            logger.error(f"Redis Error adding to set using key '{key}': {e}")
+            logger.error("Redis Error adding to set using key '%s': %s", key, e)
             raise
 
     async def set_get(self, key: str) -> set:
@@ -200,7 +234,7 @@ class RedisService:
             values = await self.r.smembers(key)
             return values
         except RedisError as e:
-            logger.error(f"Redis Error adding to set using key '{key}': {e}")
+            logger.error("Redis Error adding to set using key '%s': %s", key, e)
             raise
 
     async def set_is_member(self, key: str, value: Any) -> bool:
@@ -218,7 +252,7 @@ class RedisService:
         try:
             return await self.r.sismember(key, value)
         except RedisError as e:
-            logger.error(f"Redis Error adding to set using key '{key}': {e}")
+            logger.error("Redis Error adding to set using key '%s': %s", key, e)
             raise
 
     async def set_remove(self, key: str, values: set | list):
@@ -238,7 +272,7 @@ class RedisService:
         try:
             await self.r.srem(key, *values)
         except RedisError as e:
-            logger.error(f"Redis Error removing from set using key '{key}': {e}")
+            logger.error("Redis Error removing from set using key '%s': %s", key, e)
             raise
 
     async def expire(self, key: str, time: int):
@@ -256,7 +290,7 @@ class RedisService:
         try:
             await self.r.expire(key, time)
         except RedisError as e:
-            logger.error(f"Redis Error adding expire to key '{key}': {e}")
+            logger.error("Redis Error adding expire to key '%s': %s", key, e)
             raise
 
     async def scan_keys(self, key: str) -> list[str]:
@@ -279,7 +313,7 @@ class RedisService:
                 res.append(k)
             return res
         except RedisError as e:
-            logger.error(f"Redis Error scanning keys: {e}")
+            logger.error("Redis Error scanning keys: %s", e)
             raise
 
     async def delete_keys(self, keys: list[str]):
@@ -297,9 +331,26 @@ class RedisService:
             if keys:
                 await self.r.delete(*keys)
         except RedisError as e:
-            logger.error(f"Redis Error deleting keys: {e}")
+            logger.error("Redis Error deleting keys: %s", e)
             raise
 
+    def pipeline(self, transaction: bool = True) -> Pipeline:
+        """Create a pipeline that sends queued commands in one round trip.
+
+        Commands are queued on the returned pipeline and sent together when it
+        is executed, e.g. ``async with redis_service.pipeline() as pipe:``.
+
+        Args:
+            transaction (bool): Wrap the commands in MULTI/EXEC. Keys used
+                together in a transaction must share a Redis Cluster slot.
+
+        Returns:
+            Pipeline: A pipeline bound to the shared connection pool.
+        """
+        self._check_client()
+
+        return self.r.pipeline(transaction=transaction)
+
     def _check_client(self):
         if not self.r:
             logger.error("Redis client is not available.")
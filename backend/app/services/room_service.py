@@ -11,9 +11,9 @@ from typing import Any
 
 from fastapi import HTTPException
 
-from app.schemas import Room, RoomCreate
+from app.schemas import Page, Room, RoomCreate
 from app.services.connection_service import ConnectionService
-from app.services.cosmos_service import CosmosService
+from app.services.cosmos_service import QUERY_ALL_ITEMS, CosmosService
 from app.services.redis_service import RedisService
 
 logger = logging.getLogger(__name__)
@@ -66,7 +66,7 @@ class RoomService:
             raise ValueError("User ID missing on room creation")
 
         if await self.get_user_room(user_id=user_id):
-            logger.warning(f"User '{user_id}' currently in another room")
+            logger.warning("User '%s' currently in another room", user_id)
             raise HTTPException(
                 status_code=409,
                 detail="User already in another room",
@@ -106,7 +106,7 @@ class RoomService:
                 key=f"user:{user_id}:room", value=room_id
             )
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for creating room: {e}")
+            logger.warning("Redis unavailable for creating room: %s", e)
 
         # Write new room into cosmos
         await self._cosmos_service.add_item(item=cosmos_room, container_type="rooms")
@@ -140,7 +140,9 @@ class RoomService:
 
         if await self.get_user_room(user_id=user_id):
             logger.warning(
-                f"User '{user_id}' currently in another room, unable to join {room_id}"
+                "User '%s' currently in another room, unable to join %s",
+                user_id,
+                room_id,
             )
             raise HTTPException(
                 status_code=409,
@@ -166,7 +168,7 @@ class RoomService:
             await self._redis_service.expire(f"room:{room_id}:users", 86400)
             await self._redis_service.expire(f"user:{user_id}:room", 86400)
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for joining room: {e}")
+            logger.warning("Redis unavailable for joining room: %s", e)
 
         # Add user to room list
         patch_operation = [{"op": "add", "path": "/users/-", "value": user_id}]
@@ -209,13 +211,13 @@ class RoomService:
 
         # Only user in room, delete room
         if len(room.users) == 1:
-            logger.info(f"No more users in room '{room_id}', deleting room")
+            logger.info("No more users in room '%s', deleting room", room_id)
             await self.delete_room(room_id=room_id)
             return
 
         if room is None:
             logger.warning(
-                f"Room '{room_id}' not found when leaving for user '{user_id}'"
+                "Room '%s' not found when leaving for user '%s'", room_id, user_id
             )
             raise HTTPException(
                 status_code=404,
@@ -228,7 +230,7 @@ class RoomService:
 
             await self._redis_service.delete_keys(keys=[f"user:{user_id}:room"])
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for leaving room: {e}")
+            logger.warning("Redis unavailable for leaving room: %s", e)
 
         try:
             item = await self._cosmos_service.get_item(
@@ -250,14 +252,14 @@ class RoomService:
                     container_type="rooms",
                 )
             else:
-                logger.warning(f"User list not found in cosmos for room '{room_id}'")
+                logger.warning("User list not found in cosmos for room '%s'", room_id)
                 raise HTTPException(
                     status_code=404, detail=f"User '{user_id}' not found in room"
                 )
         except ValueError:
-            logger.warning(f"Tag '{room_id}' not found in the list, no changes made.")
+            logger.warning("Tag '%s' not found in the list, no changes made.", room_id)
         except Exception as e:
-            logger.error(f"An error occurred: {e}")
+            logger.error("An error occurred: %s", e)
 
         patch_operation = [{"op": "remove", "path": "/room"}]
 
@@ -291,13 +293,15 @@ class RoomService:
                 }
                 return Room.model_validate(full_room_data)
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for getting room: {e}")
+            logger.warning("Redis unavailable for getting room: %s", e)
         except Exception as e:
             logger.warning(
-                f"Failed to reconstruct room from Redis for '{room_id}': {e}. Fetching from DB"
+                "Failed to reconstruct room from Redis for '%s': %s. Fetching from DB",
+                room_id,
+                e,
             )
 
-        logger.info(f"Room '{room_id}' is incomplete in cache, checking database")
+        logger.info("Room '%s' is incomplete in cache, checking database", room_id)
 
         room_data_from_db = await self._cosmos_service.get_item(
             item_id=room_id, partition_key=room_id, container_type="rooms"
@@ -306,7 +310,7 @@ class RoomService:
         if room_data_from_db:
             try:
                 room_object = Room.model_validate(room_data_from_db)
-                logger.info(f"Restoring room '{room_id}' to Redis cache.")
+                logger.info("Restoring room '%s' to Redis cache.", room_id)
 
                 # Separate the data for storage
                 room_data = room_object.model_dump(
@@ -328,14 +332,14 @@ class RoomService:
                     await self._redis_service.expire(f"room:{room_id}:users", 86400)
                     await self._redis_service.expire(f"room:{room_id}:state", 86400)
                 except HTTPException as e:
-                    logger.warning(f"Redis unavailable for writing new room: {e}")
+                    logger.warning("Redis unavailable for writing new room: %s", e)
 
                 return room_object
             except Exception as e:
-                logger.error(f"Invalid room data in CosmosDB for '{room_id}': {e}")
+                logger.error("Invalid room data in CosmosDB for '%s': %s", room_id, e)
                 return None
 
-        logger.warning(f"Room '{room_id}' not found in any data source.")
+        logger.warning("Room '%s' not found in any data source.", room_id)
         return None
 
     async def delete_room(self, room_id: str):
@@ -365,7 +369,7 @@ class RoomService:
             # Deleting all keys in redis
             await self._redis_service.delete_keys(keys=keys_to_delete)
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for deleting room: {e}")
+            logger.warning("Redis unavailable for deleting room: %s", e)
 
         # Deleting room in cosmos
         await self._cosmos_service.delete_item(
@@ -385,7 +389,7 @@ class RoomService:
 
         # TODO: Make a publish in redis into room_update channel for room deletions locally
 
-        logger.info(f"Successfully deleted room '{room_id}' in database")
+        logger.info("Successfully deleted room '%s' in database", room_id)
 
     async def set_game_state(self, room_id: str, game_state: dict):
         """Sets the game state in redis and cosmos database.
@@ -405,7 +409,7 @@ class RoomService:
             )
             await self._redis_service.expire(f"room:{room_id}:state", 86400)
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for setting room: {e}")
+            logger.warning("Redis unavailable for setting room: %s", e)
 
         patch_operation = [{"op": "add", "path": "/game_state", "value": game_state}]
 
@@ -435,7 +439,7 @@ class RoomService:
                 key=f"room:{room_id}:state"
             )
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for getting game state: {e}")
+            logger.warning("Redis unavailable for getting game state: %s", e)
 
         game_state = json.loads(game_state_json)
 
@@ -458,12 +462,12 @@ class RoomService:
                     )
                     await self._redis_service.expire(f"room:{room_id}:state", 86400)
                 except HTTPException as e:
-                    logger.warning(f"Redis unavailable for setting game state: {e}")
+                    logger.warning("Redis unavailable for setting game state: %s", e)
 
                 return game_state
 
         logger.warning(
-            f"Game state not found in both redis and cosmos for room '{room_id}'"
+            "Game state not found in both redis and cosmos for room '%s'", room_id
         )
         return None
 
@@ -478,7 +482,7 @@ class RoomService:
         try:
             await self._redis_service.delete_keys(keys=[f"room:{room_id}:state"])
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for deleting game state: {e}")
+            logger.warning("Redis unavailable for deleting game state: %s", e)
 
         patch_operation = [{"op": "remove", "path": "/game_state"}]
 
@@ -506,10 +510,10 @@ class RoomService:
         try:
             room_id = await self._redis_service.get_value(key=f"user:{user_id}:room")
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for getting user room: {e}")
+            logger.warning("Redis unavailable for getting user room: %s", e)
 
         if room_id:
-            logger.info(f"User '{user_id}' room found in redis: {room_id}")
+            logger.info("User '%s' room found in redis: %s", user_id, room_id)
             return room_id
 
         logger.warning("User room not found in redis, checking cosmos")
@@ -528,12 +532,12 @@ class RoomService:
                     )
                     await self._redis_service.expire(f"user:{user_id}:room", 86400)
                 except HTTPException as e:
-                    logger.warning(f"Redis unavailable for setting user room: {e}")
+                    logger.warning("Redis unavailable for setting user room: %s", e)
 
                 return room_id
 
         logger.warning(
-            f"User room not found in both redis and cosmos for user '{user_id}'"
+            "User room not found in both redis and cosmos for user '%s'", user_id
         )
         return None
 
@@ -554,7 +558,7 @@ class RoomService:
         try:
             user_list = await self._redis_service.set_get(key=f"room:{room_id}:users")
         except HTTPException as e:
-            logger.warning(f"Redis unavailable for getting user list: {e}")
+            logger.warning("Redis unavailable for getting user list: %s", e)
 
         if user_list is not None:
             return user_list
@@ -575,12 +579,12 @@ class RoomService:
                     )
                     await self._redis_service.expire(f"room:{room_id}:users", 86400)
                 except HTTPException as e:
-                    logger.warning(f"Redis unavailable for setting user list: {e}")
+                    logger.warning("Redis unavailable for setting user list: %s", e)
 
                 return user_list
 
         logger.warning(
-            f"User list not found in both redis and cosmos for room '{room_id}'"
+            "User list not found in both redis and cosmos for room '%s'", room_id
         )
         return None
 
@@ -590,12 +594,31 @@ class RoomService:
         Returns:
             list[dict[str, Any]]: The list of all the rooms.
         """
-        query = "SELECT * FROM c"
         room_list = await self._cosmos_service.get_items_by_query(
-            query=query, container_type="rooms"
+            query=QUERY_ALL_ITEMS, container_type="rooms"
         )
         return room_list
 
+    async def get_rooms_page(
+        self, page_size: int, continuation_token: str | None = None
+    ) -> Page[dict[str, Any]]:
+        """Gets one page of rooms from the cosmos database.
+
+        Args:
+            page_size (int): Maximum number of rooms in the page.
+            continuation_token (str, optional): Cursor from the previous page.
+
+        Returns:
+            Page[dict[str, Any]]: The rooms and the cursor for the next page.
+        """
+        rooms, next_token = await self._cosmos_service.paginate_query(
+            query=QUERY_ALL_ITEMS,
+            container_type="rooms",
+            page_size=page_size,
+            continuation_token=continuation_token,
+        )
+        return Page[dict[str, Any]](items=rooms, next=next_token)
+
     async def check_user_in_room(self, user_id: str, room_id: str) -> bool:
         """Check if user is in the room.
 
@@ -7,7 +7,11 @@ from fastapi import HTTPException, status
 
 from app.auth import get_password_hash
 from app.schemas import User, UserCreate
-from app.services.cosmos_service import CosmosService
+from app.services.cosmos_service import (
+    QUERY_USER_BY_EMAIL,
+    QUERY_USER_BY_USERNAME,
+    CosmosService,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,27 +22,26 @@ class UserService:
 
     async def create_user(self, user: UserCreate) -> dict[str, Any]:
         logger.info(
-            f"Attempting to create user: '{user.username}', email: '{user.email}'"
+            "Attempting to create user: '%s', email: '%s'", user.username, user.email
         )
 
         # Check if username is valid
         pattern = r"^[a-zA-Z0-9_-]{3,20}$"
         if not bool(re.match(pattern, user.username)):
-            logger.warning(f"Username '{user.username}' has invalid characters")
+            logger.warning("Username '%s' has invalid characters", user.username)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid username '{user.username}'",
             )
 
         # Before creating a user, let's ensure the email doesn't already exist to prevent issues
-        logger.info(f"Checking for existing email: '{user.email}'")
-        query = "SELECT * FROM c WHERE c.email_lower = @email"
+        logger.info("Checking for existing email: '%s'", user.email)
         parameters = [{"name": "@email", "value": user.email.lower()}]
 
         existing_users_by_email = await self._cosmos_service.get_items_by_query(
-            query=query, container_type="users", parameters=parameters
+            query=QUERY_USER_BY_EMAIL, container_type="users", parameters=parameters
         )
-        logger.info(f"Result of email query: {existing_users_by_email}")
+        logger.info("Result of email query: %s", existing_users_by_email)
         if existing_users_by_email:
             logger.warning("Email already registered, raising 409.")
             raise HTTPException(
@@ -46,7 +49,7 @@ class UserService:
             )
 
         # Also ensure username is unique
-        logger.info(f"Checking for existing ID: '{user.username}'")
+        logger.info("Checking for existing ID: '%s'", user.username)
         if not await self.check_user_exists(username=user.username):
             logger.info(
                 "Username not found (get_item returned None), proceeding with creation."
@@ -70,9 +73,9 @@ class UserService:
         )
         item = new_user.model_dump()
 
-        logger.info(f"Adding new user to Cosmos DB: {item['id']}")
+        logger.info("Adding new user to Cosmos DB: %s", item["id"])
         await self._cosmos_service.add_item(item=item, container_type="users")
-        logger.info(f"User '{user.username}' created successfully.")
+        logger.info("User '%s' created successfully.", user.username)
 
         new_item = item.copy()
         new_item.pop("password", None)
@@ -80,26 +83,29 @@ class UserService:
         return new_item
 
     async def delete_user(self, user_id: str):
-        logger.info(f"Deleting user '{user_id}' from Cosmos DB")
+        logger.info("Deleting user '%s' from Cosmos DB", user_id)
         await self._cosmos_service.delete_item(
             item_id=user_id, partition_key=user_id, container_type="users"
         )
-        logger.info(f"User '{user_id}' deleted successfully.")
+        logger.info("User '%s' deleted successfully.", user_id)
 
     async def get_user_by_username(self, username: str) -> User:
-        logger.info(f"Attempting to get user: '{username}'")
+        logger.info("Attempting to get user: '%s'", username)
         if not username:
             raise ValueError("Missing username")
 
         try:
-            query = "SELECT * FROM c WHERE c.username_lower = @username"
             parameters = [{"name": "@username", "value": username.lower()}]
             user = await self._cosmos_service.get_items_by_query(
-                query=query, container_type="users", parameters=parameters
+                query=QUERY_USER_BY_USERNAME,
+                container_type="users",
+                parameters=parameters,
             )
         except HTTPException as e:
             logger.error(
-                f"Exception caught in get_item check: Status Code={e.status_code}, Detail={e.detail}"
+                "Exception caught in get_item check: Status Code=%s, Detail=%s",
+                e.status_code,
+                e.detail,
             )
             if e.status_code != 404:
                 logger.error("Re-raising non-404 exception.")
@@ -107,20 +113,20 @@ class UserService:
             else:
                 logger.warning("Username not found")
         except Exception as e:
-            logger.error(f"Unexpected exception in get_item check: {e}")
+            logger.error("Unexpected exception in get_item check: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Database error during ID check: {e}",
             ) from e
 
         if len(user) == 0:
-            logger.info(f"Username '{username}' not found")
+            logger.info("Username '%s' not found", username)
             return None
         elif len(user) == 1:
-            logger.info(f"Username '{username}' found")
+            logger.info("Username '%s' found", username)
             return User(**user[0])
         else:
-            logger.warning(f"Multiple users with username '{username}' found")
+            logger.warning("Multiple users with username '%s' found", username)
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Multiple users with username '{username}'",
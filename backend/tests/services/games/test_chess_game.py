@@ -46,7 +46,8 @@ class TestInitializeGame:
 
         # ASSERT
         assert state.player_ids == ["player1", "player2"]
-        assert state.meta["current_player_index"] == 0
+        # White moves first and is always the first player
+        assert chess_system.get_valid_actions(state, "player1")
         assert (
             state.board_fen
             == "rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1"
@@ -65,15 +66,17 @@ class TestMakeAction:
         new_state = chess_system.make_action(initial_state, "player1", action)
 
         assert new_state.turn == 2
-        assert new_state.meta["current_player_index"] == 1
-        assert new_state.move_history == ["e2e4"]
+        # The turn passes to Black, which is read from the FEN
+        assert chess_system.get_valid_actions(new_state, "player2")
+        assert not chess_system.get_valid_actions(new_state, "player1")
+        assert new_state.move_history == ("e2e4",)
         assert new_state.finished is False
 
     def test_make_move_causes_checkmate(self, chess_system: ChessSystem):
         fools_mate_fen = "rnbqkbnr/pppp1ppp/8/4p3/5PP1/8/PPPPP2P/RNBQKBNR b KQkq - 0 2"
         state = ChessState(
             player_ids=["p1", "p2"],
-            meta={"current_player_index": 1},
+            meta={},
             board_fen=fools_mate_fen,
             turn=3,
         )
@@ -84,6 +87,21 @@ class TestMakeAction:
         assert new_state.finished is True
         assert new_state.game_result == "black_wins"
 
+    def test_make_move_causes_stalemate(self, chess_system: ChessSystem):
+        # White plays Qc7 and Black's king on a8 has no legal move
+        state = ChessState(
+            player_ids=["p1", "p2"],
+            meta={},
+            board_fen="k7/8/1K6/8/8/8/8/2Q5 w - - 0 1",
+            turn=1,
+        )
+        action = ChessAction(payload=ChessMovePayload(move="c1c7"))
+
+        new_state = chess_system.make_action(state, "p1", action)
+
+        assert new_state.finished is True
+        assert new_state.game_result == "draw"
+
     def test_resign_action_ends_game(
         self, chess_system: ChessSystem, initial_state: ChessState
     ):
@@ -99,6 +117,50 @@ class TestMakeAction:
         assert new_state.game_result == "black_wins"
         assert new_state.board_fen == initial_state.board_fen  # Board is unchanged
 
+    def test_make_action_accepts_raw_dicts(
+        self, chess_system: ChessSystem, initial_state: ChessState
+    ):
+        # The websocket router passes the stored state and client action as dicts
+        new_state = chess_system.make_action(
+            initial_state.model_dump(),
+            "player1",
+            {"type": "MAKE_MOVE", "payload": {"move": "e2e4"}},
+        )
+
+        assert isinstance(new_state, ChessState)
+        assert new_state.move_history == ("e2e4",)
+
+    def test_make_action_builds_board_once(
+        self, chess_system: ChessSystem, initial_state: ChessState, mocker
+    ):
+        spy = mocker.spy(chess_system, "_create_board_from_state")
+        action = ChessAction(payload=ChessMovePayload(move="e2e4"))
+
+        chess_system.make_action(initial_state, "player1", action)
+
+        assert spy.call_count == 1
+
+    def test_make_action_state_passes_validation(
+        self, chess_system: ChessSystem, initial_state: ChessState
+    ):
+        # The new state skips the validator, so it must still satisfy it
+        action = ChessAction(payload=ChessMovePayload(move="e2e4"))
+
+        new_state = chess_system.make_action(initial_state, "player1", action)
+
+        revalidated = ChessState.model_validate(new_state.model_dump())
+        assert revalidated == new_state
+
+    def test_move_history_round_trips_through_json(
+        self, chess_system: ChessSystem, initial_state: ChessState
+    ):
+        action = ChessAction(payload=ChessMovePayload(move="e2e4"))
+        new_state = chess_system.make_action(initial_state, "player1", action)
+
+        # Stored as a JSON list, loaded back as a tuple
+        restored = ChessState.model_validate_json(new_state.model_dump_json())
+        assert restored.move_history == ("e2e4",)
+
     def test_make_invalid_move_raises_error(
         self, chess_system: ChessSystem, initial_state: ChessState
     ):
@@ -107,6 +169,33 @@ class TestMakeAction:
             chess_system.make_action(initial_state, "player1", action)
 
 
+class TestBoardCache:
+    def test_boards_are_parsed_once_and_copied(
+        self, chess_system: ChessSystem, initial_state: ChessState
+    ):
+        board1 = chess_system._create_board_from_state(initial_state)
+        board2 = chess_system._create_board_from_state(initial_state)
+
+        # Each caller gets its own board, so pushing a move does not leak
+        assert board1 is not board2
+        board1.push_uci("e2e4")
+        assert board2.fen() == initial_state.board_fen
+
+    def test_borrowed_board_is_restored(
+        self, chess_system: ChessSystem, initial_state: ChessState
+    ):
+        # Moves pushed while borrowing are undone on exit, even on error
+        with pytest.raises(RuntimeError):
+            with chess_system._borrow_board(initial_state) as board:
+                board.push_uci("e2e4")
+                board.push_uci("e7e5")
+                raise RuntimeError
+
+        with chess_system._borrow_board(initial_state) as board:
+            assert board.fen() == initial_state.board_fen
+            assert not board.move_stack
+
+
 class TestValidActions:
     def test_get_valid_actions_for_current_player(
         self, chess_system: ChessSystem, initial_state: ChessState
@@ -118,6 +207,33 @@ class TestValidActions:
         assert actions[0].type == "RESIGN"
         assert actions[1].type == "MAKE_MOVE"
 
+    def test_get_valid_actions_match_validated_actions(
+        self, chess_system: ChessSystem, initial_state: ChessState
+    ):
+        actions = chess_system.get_valid_actions(initial_state, "player1")
+
+        # Actions built without validation still dump and compare like real ones
+        for action in actions:
+            assert ChessAction.model_validate(action.model_dump()) == action
+        assert ChessAction(payload=ChessMovePayload(move="e2e4")) in actions
+
+    def test_get_valid_actions_is_a_lazy_sequence(
+        self, chess_system: ChessSystem, initial_state: ChessState
+    ):
+        actions = chess_system.get_valid_actions(initial_state, "player1")
+
+        # Indexing, slicing and iteration all agree
+        listed = list(actions)
+        assert actions[-1] == listed[-1]
+        assert actions[1:3] == listed[1:3]
+        with pytest.raises(IndexError):
+            actions[len(actions)]
+
+        # Membership only looks at the move, never builds the list
+        assert ChessAction(type="RESIGN") in actions
+        assert ChessAction(payload=ChessMovePayload(move="e2e5")) not in actions
+        assert "e2e4" not in actions
+
     def test_get_valid_actions_for_other_player_is_empty(
         self, chess_system: ChessSystem, initial_state: ChessState
     ):
@@ -171,7 +287,7 @@ class TestChessStateValidation:
             ChessState(
                 player_ids=["p1", "p2"],
                 board_fen=invalid_fen,
-                meta={"current_player_index": 0},
+                meta={},
             )
 
     def test_illegal_position_raises_error(self):
@@ -181,7 +297,7 @@ class TestChessStateValidation:
             ChessState(
                 player_ids=["p1", "p2"],
                 board_fen=illegal_fen,
-                meta={"current_player_index": 0},
+                meta={},
             )
 
     def test_inconsistent_finished_flag_raises_error(self):
@@ -192,29 +308,48 @@ class TestChessStateValidation:
                 player_ids=["p1", "p2"],
                 game_result="white_wins",
                 finished=False,
-                meta={"current_player_index": 0},
+                meta={},
             )
 
-    def test_inconsistent_turn_white_raises_error(self):
-        # FEN is white's turn, but index is 1 (black)
-        with pytest.raises(
-            ValueError,
-            match="FEN indicates white's turn, but current_player_index is not 0",
-        ):
-            ChessState(
-                player_ids=["p1", "p2"],
-                board_fen="rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1",
-                meta={"current_player_index": 1},
-            )
+    def test_stale_player_index_in_meta_is_ignored(self, chess_system: ChessSystem):
+        # States stored before the turn was read from the FEN still carry an
+        # index in meta; the FEN alone decides whose turn it is
+        state = ChessState(
+            player_ids=["p1", "p2"],
+            board_fen="rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1",
+            meta={"current_player_index": 0},
+        )
 
-    def test_inconsistent_turn_black_raises_error(self):
-        # FEN is black's turn, but index is 0 (white)
-        with pytest.raises(
-            ValueError,
-            match="FEN indicates black's turn, but current_player_index is not 1",
-        ):
-            ChessState(
-                player_ids=["p1", "p2"],
-                board_fen="rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1",
-                meta={"current_player_index": 0},
-            )
+        assert chess_system.get_valid_actions(state, "p2")
+        assert not chess_system.get_valid_actions(state, "p1")
+
+
+class TestBoardRepresentation:
+    def test_representation_is_cached_and_read_only(
+        self, chess_system: ChessSystem, initial_state: ChessState
+    ):
+        first = chess_system.get_board_representation(initial_state)
+        second = chess_system.get_board_representation(initial_state.model_dump())
+
+        # Repeated polls of one position return the same cached mapping
+        assert first is second
+        assert first["turn"] == "white"
+        assert first["castling_rights"]["white_kingside"] is True
+
+        # Callers cannot change the cached entry
+        with pytest.raises(TypeError):
+            first["turn"] = "black"
+        with pytest.raises(TypeError):
+            first["castling_rights"]["white_kingside"] = False
+
+    def test_representation_names_en_passant_square(self, chess_system: ChessSystem):
+        # Black can capture the pawn that just moved d2d4 with e4xd3
+        state = ChessState(
+            player_ids=["p1", "p2"],
+            board_fen="rnbqkbnr/pppp1ppp/8/8/3Pp3/8/PPP1PPPP/RNBQKBNR b KQkq d3 0 3",
+            meta={},
+        )
+
+        representation = chess_system.get_board_representation(state)
+
+        assert representation["en_passant"] == "d3"
@@ -1,5 +1,6 @@
 import pytest
 
+from backend.app.services.games.game_interface import Phase
 from backend.app.services.games.lands import lands_vars as lv
 from backend.app.services.games.lands.lands import LandsSystem
 from backend.app.services.games.lands.lands_interface import (
@@ -24,6 +25,11 @@ def initial_state(lands_system: LandsSystem) -> LandsState:
     return lands_system.initialize_game(player_ids)
 
 
+def test_initial_state_passes_validation(initial_state: LandsState):
+    # The initial state skips validation, so it must still satisfy it
+    assert LandsState.model_validate(initial_state.model_dump()) == initial_state
+
+
 # --- Card Effect Tests ---
 
 
@@ -135,6 +141,35 @@ def test_darkness_effect_opponent_reveals(
     assert final_state.discard[opponent_id][lv.FIRE] == 1
 
 
+def test_darkness_reveal_choices_fit_the_hand(
+    lands_system: LandsSystem, initial_state: LandsState
+):
+    player_id = "player1"
+    opponent_id = "player2"
+    initial_state.private_state.states[player_id].hand[lv.DARKNESS] = 1
+    initial_state.private_state.states[opponent_id].hand = [5, 0, 1, 0, 0]
+
+    action = LandsAction(type="PLAY_ENERGY", payload=LandsPayload(target=lv.DARKNESS))
+    state = lands_system.make_action(initial_state, player_id, action)
+    state = lands_system.make_action(
+        state, opponent_id, LandsAction(type="COUNTER", payload=LandsPayload(target=0))
+    )
+
+    actions = lands_system.get_valid_actions(state, opponent_id)[1:]
+
+    # Only one fire card, so it can be revealed at most once
+    assert sorted(tuple(a.payload.target) for a in actions) == [
+        (lv.GRASS, lv.GRASS, lv.GRASS),
+        (lv.GRASS, lv.GRASS, lv.FIRE),
+    ]
+
+    reveal = LandsAction(
+        type="CHOOSE_TARGET", payload=LandsPayload(target=[lv.GRASS, lv.FIRE, lv.FIRE])
+    )
+    with pytest.raises(ValueError):
+        lands_system.is_action_valid(state, opponent_id, reveal)
+
+
 def test_water_effect_scry(lands_system: LandsSystem, initial_state: LandsState):
     player_id = "player1"
     initial_state.private_state.states[player_id].hand[lv.WATER] = 1
@@ -235,6 +270,22 @@ def test_deck_reshuffle(lands_system: LandsSystem, initial_state: LandsState):
     assert sum(state.discard[player_id]) == 0
 
 
+def test_draw_runs_past_the_end_of_the_deck(
+    lands_system: LandsSystem, initial_state: LandsState
+):
+    player_id = "player1"
+    initial_state.private_state.states[player_id].hand = [0, 0, 0, 0, 0]
+    initial_state.private_state.states[player_id].deck = [lv.FIRE]
+    initial_state.discard[player_id] = [0, 3, 0, 0, 0]
+
+    state = lands_system._draw_cards(initial_state, player_id, 3)
+
+    # The last deck card is drawn first, the rest come from the reshuffled discard
+    assert state.private_state.states[player_id].hand == [0, 2, 1, 0, 0]
+    assert state.private_state.states[player_id].deck == [lv.LIGHTNING]
+    assert state.discard[player_id] == [0, 0, 0, 0, 0]
+
+
 # --- Invalid Action Tests ---
 
 
@@ -529,3 +580,98 @@ def test_is_action_valid(lands_system: LandsSystem, initial_state: LandsState):
     invalid_action = LandsAction(type="CHOOSE_TARGET", payload=LandsPayload(target=0))
     with pytest.raises(ValueError):
         lands_system.is_action_valid(initial_state, player_id, invalid_action)
+
+
+def test_make_action_leaves_input_state_unchanged(
+    lands_system: LandsSystem, initial_state: LandsState
+):
+    import random
+
+    random.seed(1)
+    state = initial_state
+    for _ in range(60):
+        if state.finished:
+            break
+        player_id = state.player_ids[state.meta["curr_player_index"]]
+        action = random.choice(lands_system.get_valid_actions(state, player_id)[1:])
+        before = state.model_dump()
+
+        new_state = lands_system.make_action(state, player_id, action)
+
+        # Only the copied parts of the state may change
+        assert state.model_dump() == before
+        state = new_state
+
+
+def test_play_energy_shares_the_opponents_cards(
+    lands_system: LandsSystem, initial_state: LandsState
+):
+    player_id = "player1"
+    initial_state.private_state.states[player_id].hand[lv.FIRE] = 1
+    action = LandsAction(type="PLAY_ENERGY", payload=LandsPayload(target=lv.FIRE))
+
+    new_state = lands_system.make_action(initial_state, player_id, action)
+
+    # The opponent's cards are untouched, so they are not copied
+    old_private = initial_state.private_state.states
+    new_private = new_state.private_state.states
+    assert new_private["player2"] is old_private["player2"]
+    assert new_private[player_id] is not old_private[player_id]
+    assert new_state.meta is not initial_state.meta
+
+
+def test_shared_actions_match_validated_actions(
+    lands_system: LandsSystem, initial_state: LandsState
+):
+    actions = lands_system.get_valid_actions(initial_state, "player1")
+
+    # Shared actions skip validation but dump and compare like new ones
+    for action in actions:
+        assert LandsAction.model_validate(action.model_dump()) == action
+    assert actions is not lands_system.get_valid_actions(initial_state, "player1")
+    assert actions[0] is lands_system.get_valid_actions(initial_state, "player1")[0]
+
+
+def test_phase_advances_by_index(initial_state: LandsState):
+    phase = initial_state.phase
+
+    assert phase.current == "MAIN_PHASE"
+    assert phase.next_phase().current == "COUNTER_PHASE"
+    resolution = phase.advance(2)
+    assert resolution.current == "RESOLUTION_PHASE"
+    # Two steps from resolution wrap around past draw to main
+    assert resolution.advance(2).current == "MAIN_PHASE"
+    assert resolution.available_phases is phase.available_phases
+
+
+def test_phase_loads_by_name(initial_state: LandsState):
+    # States stored before the index was kept only name the current phase
+    stored = {
+        "current": "COUNTER_PHASE",
+        "available_phases": initial_state.phase.available_phases,
+    }
+
+    assert Phase.model_validate(stored).current_index == 2
+    assert Phase(available_phases=["A", "B"]).current == "A"
+    with pytest.raises(ValueError):
+        Phase(current="C", available_phases=["A", "B"])
+    with pytest.raises(ValueError):
+        Phase(current_index=2, available_phases=["A", "B"])
+
+    # A dumped phase loads back to the same phase
+    dumped = initial_state.phase.model_dump()
+    assert Phase.model_validate(dumped) == initial_state.phase
+
+
+def test_deep_copy_shares_only_unchanging_parts(initial_state: LandsState):
+    copied = initial_state.model_copy(deep=True)
+
+    assert copied == initial_state
+    # Parts that are changed in place are copied
+    assert copied.meta is not initial_state.meta
+    assert copied.boards["player1"] is not initial_state.boards["player1"]
+    copied.private_state.states["player1"].deck.clear()
+    assert initial_state.private_state.states["player1"].deck
+    # Parts that are only ever replaced are shared
+    assert copied.player_ids is initial_state.player_ids
+    assert copied.phase is initial_state.phase
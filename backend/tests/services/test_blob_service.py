@@ -52,7 +52,7 @@ class TestBlobServiceInitialization:
         self, mocker, mock_blob_service_client, monkeypatch
     ):
         monkeypatch.setattr(blob_service.settings, "BLOB_ENDPOINT", "test_endpoint")
-        mocker.patch("app.services.blob_service.DefaultAzureCredential")
+        mocker.patch("app.services.blob_service.get_azure_credential")
         mocker.patch(
             "app.services.blob_service.BlobServiceClient",
             return_value=mock_blob_service_client,
@@ -76,7 +76,7 @@ class TestBlobServiceMethods:
     @pytest.fixture(autouse=True)
     def setup_service(self, mocker, mock_blob_service_client, monkeypatch):
         monkeypatch.setattr(blob_service.settings, "BLOB_ENDPOINT", "test_endpoint")
-        mocker.patch("app.services.blob_service.DefaultAzureCredential")
+        mocker.patch("app.services.blob_service.get_azure_credential")
         mocker.patch(
             "app.services.blob_service.BlobServiceClient",
             return_value=mock_blob_service_client,
@@ -1,7 +1,7 @@
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
-from app.services.chat_service import ChatService
+from app.services.chat_service import ChatKeys, ChatService, user_chat_key
 from fastapi import HTTPException
 
 # --- Test Data Constants ---
@@ -21,8 +21,17 @@ def mock_cosmos_service() -> AsyncMock:
 
 @pytest.fixture
 def mock_redis_service() -> AsyncMock:
-    """Provides a mock for the asynchronous RedisService."""
-    return AsyncMock()
+    """Provides a mock for the asynchronous RedisService.
+
+    pipeline() is synchronous and hands out one mock pipeline, reachable as
+    ``mock_redis_service.pipeline.return_value``.
+    """
+    mock = AsyncMock()
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.execute = AsyncMock(return_value=[])
+    mock.pipeline = MagicMock(return_value=pipe)
+    return mock
 
 
 @pytest.fixture
@@ -37,6 +46,27 @@ def chat_service(mock_cosmos_service, mock_redis_service) -> ChatService:
 # --- Test Cases for each method ---
 
 
+## Tests for Redis key helpers
+class TestChatKeys:
+    def test_chat_keys_share_hash_tag(self):
+        # ACT
+        keys = ChatKeys.for_chat(TEST_CHAT_ID)
+
+        # ASSERT: Every key carries the chat ID as its hash tag
+        assert keys.base == f"chat:{{{TEST_CHAT_ID}}}"
+        assert keys.users == f"chat:{{{TEST_CHAT_ID}}}:users"
+        assert keys.bots == f"chat:{{{TEST_CHAT_ID}}}:bots"
+        assert keys.log == f"chat:{{{TEST_CHAT_ID}}}:messages"
+
+    def test_chat_keys_are_cached_per_chat(self):
+        # ACT & ASSERT: The same chat ID reuses the same keys object
+        assert ChatKeys.for_chat(TEST_CHAT_ID) is ChatKeys.for_chat(TEST_CHAT_ID)
+        assert ChatKeys.for_chat(TEST_CHAT_ID) is not ChatKeys.for_chat("other")
+
+    def test_user_chat_key(self):
+        assert user_chat_key(TEST_USER_ID) == f"user:{{{TEST_USER_ID}}}:chat"
+
+
 ## Tests for create_chat
 class TestCreateChat:
     @pytest.mark.asyncio
@@ -44,7 +74,8 @@ class TestCreateChat:
         self, chat_service, mock_redis_service, mock_cosmos_service
     ):
         # ARRANGE: Mock that the user is not currently in any chat room.
-        chat_service.get_user_chat = AsyncMock(return_value=None)
+        mock_redis_service.set_value_if_absent.return_value = True
+        mock_cosmos_service.get_item.return_value = {"id": TEST_USER_ID}
 
         # ACT: Call the create_chat method, patching uuid to control the chat_id.
         with patch("uuid.uuid4", return_value=TEST_CHAT_ID):
@@ -55,18 +86,44 @@ class TestCreateChat:
         assert created_chat.room_id == TEST_ROOM_ID
         assert TEST_USER_ID in created_chat.users
 
-        # ASSERT: Verify that data was written to Redis correctly.
-        assert mock_redis_service.dict_add.call_count == 1
-        assert mock_redis_service.set_add.call_count == 2  # users and bots
-        assert mock_redis_service.set_value.call_count == 2  # log and user's chat
+        # ASSERT: Verify that data was written to Redis in one round trip.
+        keys = ChatKeys.for_chat(TEST_CHAT_ID)
+        pipe = mock_redis_service.pipeline.return_value
+        assert pipe.hset.call_count == 1
+        pipe.sadd.assert_called_once_with(keys.users, TEST_USER_ID)  # no bots
+        pipe.delete.assert_called_once_with(keys.log)
+        pipe.rpush.assert_not_called()  # empty log, no list key
+        pipe.execute.assert_awaited_once()
+        mock_redis_service.set_value_if_absent.assert_awaited_once_with(
+            key=f"user:{{{TEST_USER_ID}}}:chat", value=TEST_CHAT_ID, time=86400
+        )
 
         # ASSERT: Verify that data was written to Cosmos correctly.
         mock_cosmos_service.add_item.assert_awaited_once()
         mock_cosmos_service.patch_item.assert_awaited_once()
 
     @pytest.mark.asyncio
-    async def test_create_chat_fails_if_user_already_in_room(self, chat_service):
+    async def test_create_chat_fails_if_user_already_in_room(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
         # ARRANGE: Mock that the user is already in a chat room.
+        mock_redis_service.set_value_if_absent.return_value = False
+
+        # ACT & ASSERT: Expect a 409 Conflict HTTPException.
+        with pytest.raises(HTTPException) as exc_info:
+            await chat_service.create_chat(TEST_USER_ID, TEST_ROOM_ID)
+
+        assert exc_info.value.status_code == 409
+        mock_cosmos_service.add_item.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_create_chat_checks_db_if_redis_unavailable(
+        self, chat_service, mock_redis_service
+    ):
+        # ARRANGE: Redis is down and the database says the user is in a chat.
+        mock_redis_service.set_value_if_absent.side_effect = HTTPException(
+            status_code=503
+        )
         chat_service.get_user_chat = AsyncMock(return_value="existing-chat")
 
         # ACT & ASSERT: Expect a 409 Conflict HTTPException.
@@ -75,6 +132,65 @@ class TestCreateChat:
 
         assert exc_info.value.status_code == 409
 
+    @pytest.mark.asyncio
+    async def test_create_chat_releases_claim_on_db_failure(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The claim succeeds but writing the chat to Cosmos fails.
+        mock_redis_service.set_value_if_absent.return_value = True
+        mock_cosmos_service.get_item.return_value = {"id": TEST_USER_ID}
+        mock_cosmos_service.add_item.side_effect = HTTPException(status_code=500)
+
+        # ACT & ASSERT
+        with pytest.raises(HTTPException):
+            await chat_service.create_chat(TEST_USER_ID, TEST_ROOM_ID)
+
+        # ASSERT: The user's chat key was released again
+        mock_redis_service.delete_keys.assert_awaited_once_with(
+            keys=[f"user:{{{TEST_USER_ID}}}:chat"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_chat_releases_claim_on_user_patch_failure(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The chat is written but recording it on the user fails.
+        mock_redis_service.set_value_if_absent.return_value = True
+        mock_cosmos_service.get_item.return_value = {"id": TEST_USER_ID}
+        mock_cosmos_service.patch_item.side_effect = HTTPException(status_code=500)
+
+        # ACT & ASSERT
+        with pytest.raises(HTTPException):
+            await chat_service.create_chat(TEST_USER_ID, TEST_ROOM_ID)
+
+        # ASSERT: The user's chat key was released again
+        mock_redis_service.delete_keys.assert_awaited_once_with(
+            keys=[f"user:{{{TEST_USER_ID}}}:chat"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_create_chat_checks_db_after_expired_claim(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The Redis key expired, but the user document still has a chat.
+        mock_redis_service.set_value_if_absent.return_value = True
+        mock_cosmos_service.get_item.return_value = {
+            "id": TEST_USER_ID,
+            "chat": "existing-chat",
+        }
+
+        # ACT & ASSERT: Expect a 409 Conflict HTTPException.
+        with pytest.raises(HTTPException) as exc_info:
+            await chat_service.create_chat(TEST_USER_ID, TEST_ROOM_ID)
+
+        assert exc_info.value.status_code == 409
+        mock_cosmos_service.add_item.assert_not_awaited()
+
+        # ASSERT: The key is restored to the chat the user is really in
+        mock_redis_service.set_value.assert_awaited_once_with(
+            key=f"user:{{{TEST_USER_ID}}}:chat", value="existing-chat"
+        )
+
 
 ## Tests for get_chat
 class TestGetChat:
@@ -83,16 +199,14 @@ class TestGetChat:
         self, chat_service, mock_redis_service, mock_cosmos_service
     ):
         # ARRANGE: Simulate a full cache hit.
-        mock_redis_service.dict_get_all.return_value = {
-            "id": TEST_CHAT_ID,
-            "room_id": TEST_ROOM_ID,
-            "creator_id": "user1",
-        }
-        mock_redis_service.set_get.side_effect = [
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [
+            {"id": TEST_CHAT_ID, "room_id": TEST_ROOM_ID, "creator_id": "user1"},
             {"user1"},  # For users
             set(),  # For bots
+            ['{"sender": "user1", "message": "hi"}'],  # Chat log
+            *[True] * 4,  # TTLs refreshed
         ]
-        mock_redis_service.get_value.return_value = "[]"  # Empty chat log
 
         # ACT
         chat = await chat_service.get_chat(TEST_CHAT_ID)
@@ -100,6 +214,7 @@ class TestGetChat:
         # ASSERT
         assert chat is not None
         assert chat.id == TEST_CHAT_ID
+        assert [message.message for message in chat.chat_log] == ["hi"]
         mock_cosmos_service.get_item.assert_not_awaited()  # Should not touch the database
 
     @pytest.mark.asyncio
@@ -107,13 +222,17 @@ class TestGetChat:
         self, chat_service, mock_redis_service, mock_cosmos_service
     ):
         # ARRANGE: Simulate a cache miss and a database hit.
-        mock_redis_service.dict_get_all.return_value = {}  # Cache is empty
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.side_effect = [
+            [{}, set(), set(), [], *[False] * 4],  # Cache is empty
+            [],  # Cache repopulated
+        ]
         db_data = {
             "id": TEST_CHAT_ID,
             "room_id": TEST_ROOM_ID,
             "users": ["user1"],
             "bots": [],
-            "chat_log": [],
+            "chat_log": [{"sender": "user1", "message": "hello"}],
         }
         mock_cosmos_service.get_item.return_value = db_data
 
@@ -125,16 +244,21 @@ class TestGetChat:
         assert chat.id == TEST_CHAT_ID
         mock_cosmos_service.get_item.assert_awaited_once()
         # ASSERT: Check that the cache was repopulated.
-        mock_redis_service.dict_add.assert_awaited_once()
-        assert mock_redis_service.set_add.call_count == 2  # users and bots
-        mock_redis_service.set_value.assert_awaited_once()  # chat log
+        keys = ChatKeys.for_chat(TEST_CHAT_ID)
+        assert pipe.hset.call_count == 1
+        pipe.sadd.assert_called_once_with(keys.users, "user1")  # no bots
+        pipe.rpush.assert_called_once()
+        assert pipe.rpush.call_args.args[0] == keys.log
+        assert len(pipe.rpush.call_args.args) == 2  # one message
+        assert pipe.execute.await_count == 2
 
     @pytest.mark.asyncio
     async def test_get_chat_not_found(
         self, chat_service, mock_redis_service, mock_cosmos_service
     ):
         # ARRANGE: Simulate a cache miss and a database miss.
-        mock_redis_service.dict_get_all.return_value = {}
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [{}, set(), set(), [], *[False] * 4]
         mock_cosmos_service.get_item.return_value = None
 
         # ACT
@@ -151,9 +275,13 @@ class TestGetChatLog:
         self, chat_service, mock_redis_service, mock_cosmos_service
     ):
         # ARRANGE: Simulate a cache hit.
-        mock_redis_service.get_value.return_value = (
-            '[{"sender": "user1", "message": "hello"}]'
-        )
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [
+            1,  # Chat is cached
+            ['{"sender": "user1", "message": "hello"}'],
+            True,
+            True,
+        ]
 
         # ACT
         chat_log = await chat_service.get_chat_log(TEST_CHAT_ID)
@@ -169,7 +297,8 @@ class TestGetChatLog:
         self, chat_service, mock_redis_service, mock_cosmos_service
     ):
         # ARRANGE: Simulate a cache miss and a database hit.
-        mock_redis_service.get_value.return_value = None
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [0, [], False, False]
         db_data = {"chat_log": [{"sender": "user1", "message": "hello from db"}]}
         mock_cosmos_service.get_item.return_value = db_data
 
@@ -182,22 +311,65 @@ class TestGetChatLog:
         assert chat_log[0].message == "hello from db"
         mock_cosmos_service.get_item.assert_awaited_once()
 
+    @pytest.mark.asyncio
+    async def test_get_chat_log_json_returns_empty_cached_log(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The chat is cached but has no messages, so no list key
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [1, [], True, False]
+
+        # ACT
+        chat_log = await chat_service.get_chat_log_json(TEST_CHAT_ID)
+
+        # ASSERT
+        assert chat_log == "[]"
+        mock_cosmos_service.get_item.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_chat_log_json_returns_cached_text(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: Simulate a cache hit.
+        cached_messages = [
+            '{"sender":"user1","message":"hello"}',
+            '{"sender":"user2","message":"hi"}',
+        ]
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [1, cached_messages, True, True]
+
+        # ACT
+        chat_log = await chat_service.get_chat_log_json(TEST_CHAT_ID)
+
+        # ASSERT: The cached messages are joined into an array untouched
+        assert chat_log == f"[{cached_messages[0]},{cached_messages[1]}]"
+        mock_cosmos_service.get_item.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_get_chat_log_json_not_found(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: Simulate a miss in both data sources.
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [0, [], False, False]
+        mock_cosmos_service.get_item.return_value = None
+
+        # ACT
+        chat_log = await chat_service.get_chat_log_json(TEST_CHAT_ID)
+
+        # ASSERT
+        assert chat_log is None
+
 
 ## Tests for add_message_to_chat
 class TestAddMessageToChat:
     @pytest.mark.asyncio
-    async def test_add_message_to_chat_success(self, chat_service, mock_redis_service):
-        # ARRANGE
-        from app.schemas import Chat
-
-        chat_service.get_chat = AsyncMock(
-            return_value=Chat(
-                id=TEST_CHAT_ID,
-                room_id=TEST_ROOM_ID,
-                users={TEST_USER_ID},
-                chat_log=[],
-            )
-        )
+    async def test_add_message_to_chat_success(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The chat is cached and the user is a member
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [3, True, True]
         message = "Hello, world!"
 
         # ACT
@@ -208,28 +380,95 @@ class TestAddMessageToChat:
         # ASSERT
         assert chat_message.sender == TEST_USER_ID
         assert chat_message.message == message
-        mock_redis_service.set_value.assert_awaited_once()
 
-    @pytest.mark.asyncio
-    async def test_add_message_to_chat_fails_if_user_not_in_chat(self, chat_service):
-        # ARRANGE
-        from app.schemas import Chat
-
-        chat_service.get_chat = AsyncMock(
-            return_value=Chat(
-                id=TEST_CHAT_ID,
-                room_id=TEST_ROOM_ID,
-                users={"another-user"},
-                chat_log=[],
-            )
+        # ASSERT: Membership and the append went out in one round trip
+        keys = ChatKeys.for_chat(TEST_CHAT_ID)
+        pipe.eval.assert_called_once()
+        assert pipe.eval.call_args.args[1:] == (
+            3,
+            keys.base,
+            keys.users,
+            keys.log,
+            TEST_USER_ID,
+            chat_message.model_dump_json(),
         )
-        message = "Hello, world!"
+        pipe.execute.assert_awaited_once()
+        mock_cosmos_service.get_item.assert_not_awaited()
+        mock_cosmos_service.patch_item.assert_awaited_once()
+        mock_redis_service.delete_keys.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_add_message_to_chat_fails_if_user_not_in_chat(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The user is not in the cached user set or the database
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [-1, True, True]
+        mock_cosmos_service.get_item.return_value = {"users": ["user-456"]}
 
         # ACT & ASSERT
         with pytest.raises(HTTPException) as exc_info:
-            await chat_service.add_message_to_chat(TEST_CHAT_ID, TEST_USER_ID, message)
+            await chat_service.add_message_to_chat(
+                TEST_CHAT_ID, TEST_USER_ID, "Hello, world!"
+            )
 
         assert exc_info.value.status_code == 403
+        mock_cosmos_service.patch_item.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_add_message_to_missing_chat_is_not_found(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The chat exists in neither Redis nor Cosmos
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [0, False, False]
+        mock_cosmos_service.get_item.return_value = None
+
+        # ACT & ASSERT: A missing chat is a 404, not a 403 for a non-member
+        with pytest.raises(HTTPException) as exc_info:
+            await chat_service.add_message_to_chat(
+                TEST_CHAT_ID, TEST_USER_ID, "Hello, world!"
+            )
+
+        assert exc_info.value.status_code == 404
+
+    @pytest.mark.asyncio
+    async def test_add_message_to_uncached_chat_clears_cache(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The chat is not cached, the database has the user as member
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.execute.return_value = [0, False, False]
+        mock_cosmos_service.get_item.return_value = {"users": [TEST_USER_ID]}
+
+        # ACT
+        await chat_service.add_message_to_chat(
+            TEST_CHAT_ID, TEST_USER_ID, "Hello, world!"
+        )
+
+        # ASSERT: The message is stored and the partial cache is dropped
+        keys = ChatKeys.for_chat(TEST_CHAT_ID)
+        mock_cosmos_service.patch_item.assert_awaited_once()
+        mock_redis_service.delete_keys.assert_awaited_once_with(
+            keys=[keys.base, keys.log]
+        )
+
+    @pytest.mark.asyncio
+    async def test_add_message_to_chat_when_redis_unavailable(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: Redis is down, the database has the user as member
+        mock_redis_service.pipeline.side_effect = HTTPException(status_code=503)
+        mock_cosmos_service.get_item.return_value = {"users": [TEST_USER_ID]}
+
+        # ACT
+        chat_message = await chat_service.add_message_to_chat(
+            TEST_CHAT_ID, TEST_USER_ID, "Hello, world!"
+        )
+
+        # ASSERT
+        assert chat_message.sender == TEST_USER_ID
+        mock_cosmos_service.patch_item.assert_awaited_once()
 
 
 ## Tests for leave_chat
@@ -293,7 +532,9 @@ class TestDeleteChat:
     ):
         # ARRANGE
         chat_service.get_user_list = AsyncMock(return_value=[TEST_USER_ID])
-        mock_redis_service.scan_keys.return_value = [f"chat:{TEST_CHAT_ID}:extra_key"]
+        mock_redis_service.scan_keys.return_value = [
+            f"chat:{{{TEST_CHAT_ID}}}:extra_key"
+        ]
 
         # ACT
         await chat_service.delete_chat(TEST_CHAT_ID)
@@ -304,6 +545,25 @@ class TestDeleteChat:
         mock_cosmos_service.delete_item.assert_awaited_once()
         mock_cosmos_service.patch_item.assert_awaited_once()  # for the user
 
+    @pytest.mark.asyncio
+    async def test_delete_chat_patches_every_user(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE
+        user_list = [TEST_USER_ID, "user-456", "user-789"]
+        chat_service.get_user_list = AsyncMock(return_value=user_list)
+        mock_redis_service.scan_keys.return_value = []
+
+        # ACT
+        await chat_service.delete_chat(TEST_CHAT_ID)
+
+        # ASSERT: Every user document had its chat removed
+        assert mock_cosmos_service.patch_item.await_count == len(user_list)
+        patched_users = {
+            c.kwargs["item_id"] for c in mock_cosmos_service.patch_item.call_args_list
+        }
+        assert patched_users == set(user_list)
+
 
 ## Tests for get_user_chat
 class TestGetUserChatroom:
@@ -335,7 +595,7 @@ class TestGetUserChatroom:
         # ASSERT
         assert chat_id == TEST_CHAT_ID
         mock_redis_service.set_value.assert_awaited_once_with(
-            key=f"user:{TEST_USER_ID}:chat", value=TEST_CHAT_ID
+            key=f"user:{{{TEST_USER_ID}}}:chat", value=TEST_CHAT_ID
         )
 
 
@@ -369,7 +629,7 @@ class TestGetUserList:
         # ASSERT
         assert user_list == [TEST_USER_ID]
         mock_redis_service.set_add.assert_awaited_once_with(
-            key=f"chat:{TEST_CHAT_ID}:users", values=[TEST_USER_ID]
+            key=f"chat:{{{TEST_CHAT_ID}}}:users", values=[TEST_USER_ID]
         )
 
 
@@ -394,20 +654,23 @@ class TestCheckUserInChat:
     @pytest.mark.asyncio
     async def test_check_user_in_chat_true(self, chat_service, mock_redis_service):
         # ARRANGE
-        mock_redis_service.get_value.return_value = TEST_CHAT_ID
+        mock_redis_service.set_is_member.return_value = True
 
         # ACT
         is_in_chat = await chat_service.check_user_in_chat(TEST_USER_ID, TEST_CHAT_ID)
 
         # ASSERT
         assert is_in_chat is True
+        mock_redis_service.set_is_member.assert_awaited_once_with(
+            key=f"chat:{{{TEST_CHAT_ID}}}:users", value=TEST_USER_ID
+        )
 
     @pytest.mark.asyncio
     async def test_check_user_in_chat_false(
         self, chat_service, mock_redis_service, mock_cosmos_service
     ):
         # ARRANGE
-        mock_redis_service.get_value.return_value = "another-chat-id"
+        mock_redis_service.set_is_member.return_value = False
         mock_cosmos_service.get_item.return_value = None
 
         # ACT
@@ -416,6 +679,20 @@ class TestCheckUserInChat:
         # ASSERT
         assert is_in_chat is False
 
+    @pytest.mark.asyncio
+    async def test_check_user_in_chat_from_db_on_cache_miss(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The user set is not cached but the database has the user.
+        mock_redis_service.set_is_member.return_value = False
+        mock_cosmos_service.get_item.return_value = {"users": [TEST_USER_ID]}
+
+        # ACT
+        is_in_chat = await chat_service.check_user_in_chat(TEST_USER_ID, TEST_CHAT_ID)
+
+        # ASSERT
+        assert is_in_chat is True
+
 
 ## Tests for join_chat
 class TestJoinChat:
@@ -425,30 +702,75 @@ class TestJoinChat:
     ):
         # ARRANGE
         joining_user_id = "user-456"
-        chat_service.get_user_chat = AsyncMock(return_value=None)
+        mock_redis_service.set_value_if_absent.return_value = True
+        mock_cosmos_service.get_item.return_value = {"id": joining_user_id}
         chat_service.get_user_list = AsyncMock(return_value=["user-123"])
 
         # ACT
         await chat_service.join_chat(TEST_CHAT_ID, joining_user_id)
 
-        # ASSERT: Redis was updated
-        mock_redis_service.set_add.assert_awaited_once_with(
-            key=f"chat:{TEST_CHAT_ID}:users", values=[joining_user_id]
+        # ASSERT: Redis was updated in one round trip
+        pipe = mock_redis_service.pipeline.return_value
+        pipe.sadd.assert_called_once_with(
+            f"chat:{{{TEST_CHAT_ID}}}:users", joining_user_id
         )
-        mock_redis_service.set_value.assert_awaited_once_with(
-            key=f"user:{joining_user_id}:chat", value=TEST_CHAT_ID
+        pipe.expire.assert_called_once_with(f"chat:{{{TEST_CHAT_ID}}}:users", 86400)
+        pipe.execute.assert_awaited_once()
+        mock_redis_service.set_value_if_absent.assert_awaited_once_with(
+            key=f"user:{{{joining_user_id}}}:chat", value=TEST_CHAT_ID, time=86400
         )
 
         # ASSERT: Cosmos was updated twice (once for the chat, once for the user)
         assert mock_cosmos_service.patch_item.call_count == 2
 
     @pytest.mark.asyncio
-    async def test_join_chat_fails_if_user_already_in_room(self, chat_service):
+    async def test_join_chat_fails_if_user_already_in_room(
+        self, chat_service, mock_redis_service
+    ):
         # ARRANGE
-        chat_service.get_user_chat = AsyncMock(return_value="existing-chat")
+        mock_redis_service.set_value_if_absent.return_value = False
+        chat_service.get_user_list = AsyncMock(return_value=["user-123"])
+
+        # ACT & ASSERT
+        with pytest.raises(HTTPException) as exc_info:
+            await chat_service.join_chat(TEST_CHAT_ID, TEST_USER_ID)
+
+        assert exc_info.value.status_code == 409
+
+    @pytest.mark.asyncio
+    async def test_join_chat_releases_claim_on_db_failure(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The claim succeeds but adding the user to the chat fails.
+        mock_redis_service.set_value_if_absent.return_value = True
+        mock_cosmos_service.get_item.return_value = {"id": TEST_USER_ID}
+        mock_cosmos_service.patch_item.side_effect = HTTPException(status_code=500)
+        chat_service.get_user_list = AsyncMock(return_value=["user-456"])
 
         # ACT & ASSERT
+        with pytest.raises(HTTPException):
+            await chat_service.join_chat(TEST_CHAT_ID, TEST_USER_ID)
+
+        # ASSERT: The user's chat key was released again
+        mock_redis_service.delete_keys.assert_awaited_once_with(
+            keys=[f"user:{{{TEST_USER_ID}}}:chat"]
+        )
+
+    @pytest.mark.asyncio
+    async def test_join_chat_fails_if_db_already_lists_same_chat(
+        self, chat_service, mock_redis_service, mock_cosmos_service
+    ):
+        # ARRANGE: The Redis key expired, the user document lists this very chat
+        mock_redis_service.set_value_if_absent.return_value = True
+        mock_cosmos_service.get_item.return_value = {
+            "id": TEST_USER_ID,
+            "chat": TEST_CHAT_ID,
+        }
+        chat_service.get_user_list = AsyncMock(return_value=[TEST_USER_ID])
+
+        # ACT & ASSERT: Expect a 409 Conflict HTTPException.
         with pytest.raises(HTTPException) as exc_info:
             await chat_service.join_chat(TEST_CHAT_ID, TEST_USER_ID)
 
         assert exc_info.value.status_code == 409
+        mock_cosmos_service.patch_item.assert_not_awaited()
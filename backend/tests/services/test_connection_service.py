@@ -1,8 +1,11 @@
+import asyncio
+import json
 from unittest.mock import AsyncMock, call
 
 import pytest
 from app.schemas import BroadcastPayload
 from app.services.connection_service import ConnectionService
+from pydantic import ValidationError
 
 # --- Fixtures for Mocking and Setup ---
 
@@ -54,6 +57,27 @@ class TestConnectionService:
         # ASSERT: The user is no longer in the dictionary
         assert "user1" not in connection_service._active_connections
 
+    @pytest.mark.asyncio
+    async def test_disconnect_keeps_newer_connection(
+        self, connection_service: ConnectionService
+    ):
+        # ARRANGE: The user reconnects before the old socket is closed
+        old_websocket, new_websocket = AsyncMock(), AsyncMock()
+        await connection_service.connect(old_websocket, "user1")
+        await connection_service.connect(new_websocket, "user1")
+
+        # ACT: The old socket closes
+        connection_service.disconnect("user1", websocket=old_websocket)
+
+        # ASSERT: The newer connection is kept
+        assert connection_service._active_connections["user1"] is new_websocket
+
+        # ACT: The current socket closes
+        connection_service.disconnect("user1", websocket=new_websocket)
+
+        # ASSERT
+        assert "user1" not in connection_service._active_connections
+
     def test_disconnect_handles_nonexistent_user_gracefully(
         self, connection_service: ConnectionService
     ):
@@ -91,6 +115,21 @@ class TestConnectionService:
         # ASSERT: The connected user's websocket was not used
         mock_websocket.send_json.assert_not_awaited()
 
+    @pytest.mark.asyncio
+    async def test_send_message_with_serialized_text(
+        self, connection_service: ConnectionService, mock_websocket: AsyncMock
+    ):
+        # ARRANGE: Connect a user with our mock websocket
+        await connection_service.connect(mock_websocket, "user1")
+        message = '{"type":"GREETING","text":"hello"}'
+
+        # ACT: Send an already serialized message
+        await connection_service.send_message(message, "user1")
+
+        # ASSERT: The text is sent as is without being encoded again
+        mock_websocket.send_text.assert_awaited_once_with(message)
+        mock_websocket.send_json.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_broadcast_sends_to_all_users_when_all_are_active(
         self, connection_service: ConnectionService, mocker
@@ -99,6 +138,8 @@ class TestConnectionService:
         user_list = ["user1", "user2", "user3"]
         message = {"type": "ANNOUNCEMENT", "text": "Server is up!"}
         payload = BroadcastPayload(user_list=user_list, message=message)
+        assert payload.user_list == ("user1", "user2", "user3")
+        encoded = json.dumps(message, separators=(",", ":"))
 
         # Mock the dependencies:
         # 1. Assume get_active_users_from_list returns the same list it was given.
@@ -115,13 +156,14 @@ class TestConnectionService:
         await connection_service.broadcast(payload)
 
         # ASSERT
-        # Check that send_message was called for every user.
+        # Check that send_message was called for every user with the message
+        # serialized once up front.
         assert mock_send.call_count == len(user_list)
 
         expected_calls = [
-            call(message=message, user_id="user1"),
-            call(message=message, user_id="user2"),
-            call(message=message, user_id="user3"),
+            call(message=encoded, user_id="user1"),
+            call(message=encoded, user_id="user2"),
+            call(message=encoded, user_id="user3"),
         ]
         mock_send.assert_has_calls(expected_calls, any_order=True)
 
@@ -138,6 +180,7 @@ class TestConnectionService:
 
         message = {"type": "GAME_UPDATE", "text": "Your turn!"}
         payload = BroadcastPayload(user_list=full_user_list, message=message)
+        encoded = json.dumps(message, separators=(",", ":"))
 
         # Mock the dependencies:
         # 1. CRITICAL: Make get_active_users_from_list return ONLY the active subset.
@@ -159,8 +202,8 @@ class TestConnectionService:
 
         # 2. Check that a message was sent to each active user.
         expected_calls = [
-            call(message=message, user_id="active_user1"),
-            call(message=message, user_id="active_user2"),
+            call(message=encoded, user_id="active_user1"),
+            call(message=encoded, user_id="active_user2"),
         ]
         mock_send.assert_has_calls(expected_calls, any_order=True)
 
@@ -168,6 +211,31 @@ class TestConnectionService:
         called_user_ids = [c.kwargs["user_id"] for c in mock_send.call_args_list]
         assert "inactive_user1" not in called_user_ids
 
+    @pytest.mark.asyncio
+    async def test_broadcast_validates_dict_payload(
+        self, connection_service: ConnectionService, mocker
+    ):
+        # ARRANGE
+        mock_send = mocker.patch.object(
+            connection_service, "send_message", new_callable=AsyncMock
+        )
+        mocker.patch.object(
+            connection_service, "get_active_users_from_list", return_value=["user1"]
+        )
+
+        # ACT: A raw dict is accepted and validated
+        await connection_service.broadcast({
+            "user_list": ["user1"],
+            "message": {"type": "PING"},
+        })
+
+        # ASSERT
+        mock_send.assert_awaited_once()
+
+        # ACT & ASSERT: An invalid dict is still rejected
+        with pytest.raises(ValidationError):
+            await connection_service.broadcast({"user_list": [], "message": {}})
+
     @pytest.mark.asyncio
     async def test_get_active_users_from_list(
         self, connection_service: ConnectionService, mock_websocket: AsyncMock
@@ -193,7 +261,7 @@ class TestConnectionService:
         user_list = {"user1", "user2"}
         message_data = {"move": "e4"}
 
-        # ACT
+        # ACT: Returns once the event has been published
         await connection_service.publish_event(channel, user_list, message_data)
 
         # ASSERT: Check that the redis service's method was called
@@ -203,7 +271,127 @@ class TestConnectionService:
         call_kwargs = mock_redis_service.publish_message.call_args.kwargs
         assert call_kwargs["channel_name"] == "global-channel"
 
+        # ASSERT: A lone event is sent as a single envelope, not a batch
         published_message = call_kwargs["message"]
+        assert "batch" not in published_message
         assert published_message["channel"] == channel
         assert set(published_message["payload"]["user_list"]) == user_list
         assert published_message["payload"]["message"] == message_data
+
+        await connection_service.close()
+
+    @pytest.mark.asyncio
+    async def test_broadcast_continues_when_one_send_fails(
+        self, connection_service: ConnectionService, mocker
+    ):
+        # ARRANGE
+        user_list = ["user1", "user2", "user3"]
+        message = {"type": "ANNOUNCEMENT", "text": "Server is up!"}
+        payload = BroadcastPayload(user_list=user_list, message=message)
+
+        mocker.patch.object(
+            connection_service, "get_active_users_from_list", return_value=user_list
+        )
+        mock_send = mocker.patch.object(
+            connection_service,
+            "send_message",
+            new_callable=AsyncMock,
+            side_effect=[None, RuntimeError("socket closed"), None],
+        )
+
+        # ACT: A failing socket must not abort the broadcast
+        await connection_service.broadcast(payload)
+
+        # ASSERT: Every active user was still attempted
+        assert mock_send.call_count == len(user_list)
+
+    @pytest.mark.asyncio
+    async def test_publish_event_batches_queued_events(
+        self, connection_service: ConnectionService, mock_redis_service: AsyncMock
+    ):
+        # ACT: Queue several events before the publisher gets to run
+        await asyncio.gather(
+            *(
+                connection_service.publish_event("game-updates", {"user1"}, {"i": i})
+                for i in range(3)
+            )
+        )
+
+        # ASSERT: All events went out in a single publish, in order
+        mock_redis_service.publish_message.assert_awaited_once()
+        batch = mock_redis_service.publish_message.call_args.kwargs["message"]["batch"]
+        assert [m["payload"]["message"]["i"] for m in batch] == [0, 1, 2]
+
+        await connection_service.close()
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_does_not_stop_publisher(
+        self, connection_service: ConnectionService, mock_redis_service: AsyncMock
+    ):
+        # ARRANGE: The first publish fails
+        mock_redis_service.publish_message.side_effect = [RuntimeError("down"), None]
+
+        # ACT & ASSERT: The caller sees the failure of its publish
+        with pytest.raises(RuntimeError, match="down"):
+            await connection_service.publish_event("game-updates", {"user1"}, {"i": 0})
+        await connection_service.publish_event("game-updates", {"user1"}, {"i": 1})
+
+        # ASSERT: The second event is still published
+        assert mock_redis_service.publish_message.await_count == 2
+
+        await connection_service.close()
+
+    @pytest.mark.asyncio
+    async def test_publish_event_rejects_empty_user_list(
+        self, connection_service: ConnectionService, mock_redis_service: AsyncMock
+    ):
+        # ACT & ASSERT: Nothing is queued for an event nobody would receive
+        with pytest.raises(ValueError):
+            await connection_service.publish_event("game-updates", set(), {"i": 0})
+
+        mock_redis_service.publish_message.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_publish_event_waits_for_room_in_full_queue(
+        self,
+        connection_service: ConnectionService,
+        mock_redis_service: AsyncMock,
+        monkeypatch,
+    ):
+        # ARRANGE: A queue with room for one event and a stalled Redis
+        monkeypatch.setattr(
+            connection_service, "_publish_queue", asyncio.Queue(maxsize=1)
+        )
+        stalled = asyncio.Event()
+
+        async def stall(**_kwargs):
+            await stalled.wait()
+
+        mock_redis_service.publish_message.side_effect = stall
+
+        # ACT: The first event is being published, the second fills the
+        # queue and the third has to wait for room
+        tasks = [
+            asyncio.create_task(
+                connection_service.publish_event("game-updates", {"user1"}, {"i": i})
+            )
+            for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+
+        # ASSERT: The queue stays bounded
+        assert connection_service._publish_queue.qsize() == 1
+        assert not any(task.done() for task in tasks)
+
+        # ACT: Redis recovers
+        stalled.set()
+        await asyncio.gather(*tasks)
+
+        # ASSERT: Every event was published, none was dropped
+        published = [
+            call.kwargs["message"]["payload"]["message"]["i"]
+            for call in mock_redis_service.publish_message.await_args_list
+        ]
+        assert published == [0, 1, 2]
+
+        await connection_service.close()
@@ -53,16 +53,31 @@ class TestCosmosServiceInitialization:
         # ARRANGE
         monkeypatch.setattr(cosmos_service.settings, "COSMOS_ENDPOINT", "test_endpoint")
         # Patch the credential and client classes
-        mocker.patch("app.services.cosmos_service.DefaultAzureCredential")
+        mocker.patch("app.services.cosmos_service.get_azure_credential")
         mocker.patch(
             "app.services.cosmos_service.CosmosClient", return_value=mock_cosmos_client
         )
+        mock_session = mocker.patch("app.services.cosmos_service._create_session")
 
         # ACT
         service = cosmos_service.CosmosService()
 
+        # ASSERT: Nothing is connected until the first database call
+        cosmos_service.CosmosClient.assert_not_called()
+        assert service.client is None
+
+        # ACT
+        service.get_container("users")
+
         # ASSERT
         cosmos_service.CosmosClient.assert_called_once()
+        client_kwargs = cosmos_service.CosmosClient.call_args.kwargs
+        assert "consistency_level" not in client_kwargs
+        assert "retry_total" not in client_kwargs
+        assert "retry_backoff_max" not in client_kwargs
+        transport = client_kwargs["transport"]
+        assert isinstance(transport, cosmos_service.AioHttpTransport)
+        assert transport.session is mock_session.return_value
         assert service.client is not None
         service.client.get_database_client.assert_called_once()
 
@@ -72,6 +87,42 @@ class TestCosmosServiceInitialization:
             cosmos_service.CosmosService()
 
 
+@pytest.mark.asyncio
+async def test_create_session_uses_sized_pool():
+    # ACT
+    session = cosmos_service._create_session()
+
+    # ASSERT
+    try:
+        connector = session.connector
+        assert connector.limit == cosmos_service.CONNECTION_POOL_SIZE
+        assert connector.limit_per_host == cosmos_service.CONNECTIONS_PER_HOST
+    finally:
+        await session.close()
+
+
+@pytest.mark.asyncio
+async def test_close_closes_client_and_owned_session(
+    mocker, mock_cosmos_client, monkeypatch
+):
+    # ARRANGE
+    monkeypatch.setattr(cosmos_service.settings, "COSMOS_ENDPOINT", "test_endpoint")
+    mocker.patch("app.services.cosmos_service.get_azure_credential")
+    mocker.patch(
+        "app.services.cosmos_service.CosmosClient", return_value=mock_cosmos_client
+    )
+    mock_cosmos_client.close = AsyncMock()
+    service = cosmos_service.CosmosService()
+    service.get_container("users")
+
+    # ACT
+    await service.close()
+
+    # ASSERT: The transport does not own the session, so the service closes it
+    service.client.close.assert_awaited_once()
+    assert service._session.closed
+
+
 # --- Tests for the public service methods ---
 
 
@@ -85,20 +136,171 @@ class TestCosmosServiceMethods:
         # ARRANGE
         monkeypatch.setattr(cosmos_service.settings, "COSMOS_ENDPOINT", "test_endpoint")
         # Patch the credential and client classes
-        mocker.patch("app.services.cosmos_service.DefaultAzureCredential")
+        mocker.patch("app.services.cosmos_service.get_azure_credential")
         mocker.patch(
             "app.services.cosmos_service.CosmosClient", return_value=mock_cosmos_client
         )
 
+        mocker.patch("app.services.cosmos_service._create_session")
+
         self.service = cosmos_service.CosmosService()
-        self.mock_users_container = self.service.users_container_client
-        self.mock_rooms_container = self.service.rooms_container_client
+        self.mock_users_container = self.service.get_container("users")
+        self.mock_rooms_container = self.service.get_container("rooms")
+
+    def test_get_container_returns_client_for_type(self):
+        assert self.service.get_container("users") is self.mock_users_container
+        assert self.service.get_container("rooms") is self.mock_rooms_container
+        assert (
+            self.service.get_container(cosmos_service.ContainerType.ROOMS)
+            is self.mock_rooms_container
+        )
+
+    def test_get_container_unknown_type_raises_error(self):
+        with pytest.raises(ValueError, match="does not exist"):
+            self.service.get_container("games")
 
     @pytest.mark.asyncio
     async def test_add_item_succeeds(self):
         item = {"id": "user123"}
         await self.service.add_item(item, "users")
-        self.mock_users_container.create_item.assert_awaited_once_with(body=item)
+        self.mock_users_container.create_item.assert_awaited_once_with(
+            body=item, no_response=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_items_returns_items_in_key_order(self):
+        async def read_item(item, partition_key):
+            if item == "missing":
+                raise CosmosResourceNotFoundError()
+            return {"id": item}
+
+        self.mock_users_container.read_item.side_effect = read_item
+        result = await self.service.get_items(
+            [("user1", "user1"), ("missing", "missing"), ("user2", "user2")], "users"
+        )
+        assert result == [{"id": "user1"}, None, {"id": "user2"}]
+        assert self.mock_users_container.read_item.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_get_items_by_query_uses_large_pages(self):
+        async def pages():
+            for item in [{"id": "room1"}, {"id": "room2"}]:
+                yield item
+
+        # query_items is synchronous and returns an async iterable
+        self.mock_rooms_container.query_items = MagicMock(return_value=pages())
+        result = await self.service.get_items_by_query("SELECT * FROM c", "rooms")
+        assert result == [{"id": "room1"}, {"id": "room2"}]
+        self.mock_rooms_container.query_items.assert_called_once_with(
+            query="SELECT * FROM c",
+            parameters=None,
+            max_item_count=cosmos_service.QUERY_PAGE_SIZE,
+        )
+
+    @pytest.mark.asyncio
+    async def test_stream_items_by_query_yields_items(self):
+        async def pages():
+            for item in [{"id": "room1"}, {"id": "room2"}]:
+                yield item
+
+        self.mock_rooms_container.query_items = MagicMock(return_value=pages())
+        stream = self.service.stream_items_by_query(
+            "SELECT * FROM c", "rooms", max_item_count=1
+        )
+        assert await anext(stream) == {"id": "room1"}
+        assert [item async for item in stream] == [{"id": "room2"}]
+        self.mock_rooms_container.query_items.assert_called_once_with(
+            query="SELECT * FROM c", parameters=None, max_item_count=1
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_items_by_query_scopes_to_partition(self):
+        async def pages():
+            yield {"id": "user1"}
+
+        self.mock_users_container.query_items = MagicMock(return_value=pages())
+        parameters = [{"name": "@name", "value": "test"}]
+        result = await self.service.get_items_by_query(
+            "SELECT * FROM c WHERE c.name = @name",
+            "users",
+            parameters=parameters,
+            partition_key="user1",
+        )
+        assert result == [{"id": "user1"}]
+        self.mock_users_container.query_items.assert_called_once_with(
+            query="SELECT * FROM c WHERE c.name = @name",
+            parameters=parameters,
+            max_item_count=cosmos_service.QUERY_PAGE_SIZE,
+            partition_key="user1",
+        )
+
+    @pytest.mark.asyncio
+    async def test_stream_items_by_query_maps_bad_query_to_400(self):
+        async def failing():
+            raise CosmosHttpResponseError(status_code=400, message="Syntax error")
+            yield
+
+        self.mock_rooms_container.query_items = MagicMock(return_value=failing())
+        with pytest.raises(HTTPException) as exc_info:
+            async for _ in self.service.stream_items_by_query("SELEC", "rooms"):
+                pass
+        assert exc_info.value.status_code == 400
+
+    def _mock_pages(self, container, items, continuation_token):
+        class Pages:
+            def __init__(self):
+                self.continuation_token = None
+                self.requested_token = "unset"
+
+            def __aiter__(self):
+                return self
+
+            async def __anext__(self):
+                async def page():
+                    for item in items:
+                        yield item
+
+                self.continuation_token = continuation_token
+                return page()
+
+        pages = Pages()
+
+        def by_page(token=None):
+            pages.requested_token = token
+            return pages
+
+        container.query_items = MagicMock(return_value=MagicMock(by_page=by_page))
+        return pages
+
+    @pytest.mark.asyncio
+    async def test_paginate_query_returns_page_and_cursor(self):
+        pages = self._mock_pages(self.mock_rooms_container, [{"id": "room1"}], "tok")
+
+        items, cursor = await self.service.paginate_query("SELECT * FROM c", "rooms", 1)
+
+        assert items == [{"id": "room1"}]
+        assert cursor is not None and cursor != "tok"
+        assert pages.requested_token is None
+        self.mock_rooms_container.query_items.assert_called_once_with(
+            query="SELECT * FROM c", parameters=None, max_item_count=1
+        )
+
+        # The cursor resumes from the SDK token it wraps
+        pages = self._mock_pages(self.mock_rooms_container, [{"id": "room2"}], None)
+        items, next_cursor = await self.service.paginate_query(
+            "SELECT * FROM c", "rooms", 1, continuation_token=cursor
+        )
+        assert items == [{"id": "room2"}]
+        assert next_cursor is None
+        assert pages.requested_token == "tok"
+
+    @pytest.mark.asyncio
+    async def test_paginate_query_rejects_invalid_cursor(self):
+        with pytest.raises(HTTPException) as exc_info:
+            await self.service.paginate_query(
+                "SELECT * FROM c", "rooms", 1, continuation_token="%%%"
+            )
+        assert exc_info.value.status_code == 400
 
     @pytest.mark.asyncio
     async def test_get_item_succeeds(self):
@@ -106,12 +308,62 @@ class TestCosmosServiceMethods:
         result = await self.service.get_item("room123", "room123", "rooms")
         assert result == {"id": "room123"}
 
+    @pytest.mark.asyncio
+    async def test_exists_uses_point_read(self):
+        self.mock_users_container.read_item.return_value = {"id": "user1"}
+        assert await self.service.exists("user1", "user1", "users") is True
+        self.mock_users_container.read_item.assert_awaited_once_with(
+            item="user1", partition_key="user1"
+        )
+
+    @pytest.mark.asyncio
+    async def test_exists_returns_false_when_not_found(self):
+        self.mock_users_container.read_item.side_effect = CosmosResourceNotFoundError()
+        assert await self.service.exists("user1", "user1", "users") is False
+
     @pytest.mark.asyncio
     async def test_get_item_returns_none_when_not_found(self):
         self.mock_users_container.read_item.side_effect = CosmosResourceNotFoundError()
         result = await self.service.get_item("123", "123", "users")
         assert result is None
 
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_batches_items_sharing_a_partition(self):
+        items = [
+            {"id": "msg1", "chat_id": "chat1"},
+            {"id": "msg2", "chat_id": "chat1"},
+            {"id": "msg3", "chat_id": "chat2"},
+        ]
+        await self.service.bulk_upsert(items, "users", partition_key_field="chat_id")
+
+        self.mock_users_container.execute_item_batch.assert_awaited_once_with(
+            batch_operations=[("upsert", (items[0],)), ("upsert", (items[1],))],
+            partition_key="chat1",
+        )
+        self.mock_users_container.upsert_item.assert_awaited_once_with(
+            body=items[2], no_response=True
+        )
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_splits_large_batches(self):
+        items = [{"id": f"msg{i}", "pk": "chat1"} for i in range(150)]
+        await self.service.bulk_upsert(items, "users", partition_key_field="pk")
+
+        calls = self.mock_users_container.execute_item_batch.await_args_list
+        assert [len(call.kwargs["batch_operations"]) for call in calls] == [100, 50]
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_raises_http_exception_on_cosmos_error(self):
+        self.mock_users_container.upsert_item.side_effect = CosmosHttpResponseError()
+        with pytest.raises(HTTPException) as exc_info:
+            await self.service.bulk_upsert([{"id": "user1"}], "users")
+        assert exc_info.value.status_code == 500
+
+    @pytest.mark.asyncio
+    async def test_bulk_upsert_requires_partition_key(self):
+        with pytest.raises(ValueError):
+            await self.service.bulk_upsert([{"name": "no id"}], "users")
+
     @pytest.mark.asyncio
     async def test_patch_item_raises_404_when_not_found(self):
         self.mock_users_container.patch_item.side_effect = CosmosResourceNotFoundError()
@@ -119,6 +371,35 @@ class TestCosmosServiceMethods:
             await self.service.patch_item("123", "123", {}, "users")
         assert exc_info.value.status_code == 404
 
+    @pytest.mark.asyncio
+    async def test_patch_fields_sends_set_operations(self):
+        await self.service.patch_fields(
+            "room123", "room123", {"status": "playing", "game_type": "chess"}, "rooms"
+        )
+        self.mock_rooms_container.patch_item.assert_awaited_once_with(
+            item="room123",
+            partition_key="room123",
+            patch_operations=[
+                {"op": "set", "path": "/status", "value": "playing"},
+                {"op": "set", "path": "/game_type", "value": "chess"},
+            ],
+            no_response=True,
+        )
+
+    @pytest.mark.asyncio
+    async def test_patch_fields_splits_at_operation_limit(self):
+        fields = {f"field{i}": i for i in range(12)}
+        await self.service.patch_fields("room123", "room123", fields, "rooms")
+
+        calls = self.mock_rooms_container.patch_item.await_args_list
+        assert [len(call.kwargs["patch_operations"]) for call in calls] == [10, 2]
+        assert calls[1].kwargs["patch_operations"][0]["path"] == "/field10"
+
+    @pytest.mark.asyncio
+    async def test_patch_fields_requires_fields(self):
+        with pytest.raises(ValueError):
+            await self.service.patch_fields("room123", "room123", {}, "rooms")
+
     @pytest.mark.asyncio
     async def test_delete_item_raises_http_exception_on_cosmos_error(self):
         self.mock_users_container.delete_item.side_effect = CosmosHttpResponseError()
@@ -1,3 +1,7 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
 import pytest
 from app.services.game_service_factory import GameServiceFactory
 from app.services.games.game_interface import GameSystem
@@ -45,8 +49,8 @@ def game_factory() -> GameServiceFactory:
     """
     factory = GameServiceFactory()
     factory._service_map = {
-        "chess": DummyChessSystem,
-        "ultimate_tic_tac_toe": DummyUltimateTicTacToeSystem,
+        "chess": f"{__name__}:DummyChessSystem",
+        "ultimate_tic_tac_toe": f"{__name__}:DummyUltimateTicTacToeSystem",
     }
     return factory
 
@@ -94,6 +98,53 @@ def test_get_service_creates_different_instances_for_different_games(
     assert chess_service is not ulttt_service
 
 
+def test_get_service_constructs_once_under_concurrency(
+    game_factory: GameServiceFactory, monkeypatch
+):
+    # ARRANGE: a slow constructor that counts how often it runs
+    constructed = []
+    barrier = threading.Barrier(8)
+
+    class SlowChessSystem(DummyChessSystem):
+        def __init__(self):
+            constructed.append(self)
+            time.sleep(0.01)
+
+    monkeypatch.setitem(globals(), "SlowChessSystem", SlowChessSystem)
+    game_factory._service_map = {"chess": f"{__name__}:SlowChessSystem"}
+
+    def get_chess():
+        barrier.wait()
+        return game_factory.get_service("chess")
+
+    # ACT
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        services = list(pool.map(lambda _: get_chess(), range(8)))
+
+    # ASSERT
+    assert len(constructed) == 1
+    assert all(service is constructed[0] for service in services)
+
+
+def test_default_map_resolves_lazy_paths():
+    # ARRANGE
+    from app.services.games.chess.chess_game import ChessSystem
+
+    factory = GameServiceFactory()
+
+    # ACT
+    chess_service = factory.get_service("chess")
+
+    # ASSERT
+    assert isinstance(chess_service, ChessSystem)
+    assert factory.get_service("chess") is chess_service
+
+
+def test_factory_uses_slots(game_factory: GameServiceFactory):
+    # ASSERT: no per-instance __dict__
+    assert not hasattr(game_factory, "__dict__")
+
+
 def test_get_service_raises_error_for_unknown_game_type(
     game_factory: GameServiceFactory,
 ):
@@ -24,8 +24,12 @@ class TestRedisServiceInitialization:
         service = RedisService()
 
         # ASSERT
-        mock_aioredis.from_url.assert_called_once_with(
-            "redis://localhost", decode_responses=True
+        mock_aioredis.BlockingConnectionPool.from_url.assert_called_once()
+        args, kwargs = mock_aioredis.BlockingConnectionPool.from_url.call_args
+        assert args == ("redis://localhost",)
+        assert kwargs["decode_responses"] is True
+        mock_aioredis.Redis.from_pool.assert_called_once_with(
+            mock_aioredis.BlockingConnectionPool.from_url.return_value
         )
         assert service.r is not None
 
@@ -43,7 +47,7 @@ class TestRedisServiceInitialization:
         service = RedisService()
 
         # ASSERT
-        mock_aioredis.from_url.assert_not_called()
+        mock_aioredis.BlockingConnectionPool.from_url.assert_not_called()
         assert service.r is None
 
     @patch("app.services.redis_service.aioredis")
@@ -56,7 +60,9 @@ class TestRedisServiceInitialization:
             "app.services.redis_service.settings.REDIS_CONNECTION_URL",
             "redis://localhost",
         )
-        mock_aioredis.from_url.side_effect = ConnectionError("Failed to connect")
+        mock_aioredis.BlockingConnectionPool.from_url.side_effect = ConnectionError(
+            "Failed to connect"
+        )
 
         # ACT
         service = RedisService()
@@ -80,22 +86,45 @@ class TestRedisServiceMethods:
                 "app.services.redis_service.settings.REDIS_CONNECTION_URL",
                 "redis://localhost",
             )
-            mock_aioredis.from_url.return_value = self.mock_redis_client
+            mock_aioredis.Redis.from_pool.return_value = self.mock_redis_client
             self.redis_service = RedisService()
 
     @pytest.mark.asyncio
     async def test_publish_message(self):
-        message = {"data": "test"}
+        message = {"data": "test", "text": "héllo"}
         await self.redis_service.publish_message("my-channel", message)
         self.mock_redis_client.publish.assert_awaited_once_with(
-            channel="my-channel", message=json.dumps(message)
+            channel="my-channel", message='{"data":"test","text":"héllo"}'
         )
+        published = self.mock_redis_client.publish.call_args.kwargs["message"]
+        assert json.loads(published) == message
 
     @pytest.mark.asyncio
     async def test_set_value(self):
         await self.redis_service.set_value("my_key", "my_value")
         self.mock_redis_client.set.assert_awaited_once_with("my_key", "my_value")
 
+    @pytest.mark.asyncio
+    async def test_set_value_if_absent(self):
+        self.mock_redis_client.set.return_value = True
+        result = await self.redis_service.set_value_if_absent("my_key", "my_value", 60)
+        self.mock_redis_client.set.assert_awaited_once_with(
+            "my_key", "my_value", ex=60, nx=True
+        )
+        assert result is True
+
+    @pytest.mark.asyncio
+    async def test_set_value_if_absent_existing_key(self):
+        self.mock_redis_client.set.return_value = None
+        result = await self.redis_service.set_value_if_absent("my_key", "my_value", 60)
+        assert result is False
+
+    def test_pipeline(self):
+        self.mock_redis_client.pipeline = MagicMock()
+        pipe = self.redis_service.pipeline(transaction=False)
+        self.mock_redis_client.pipeline.assert_called_once_with(transaction=False)
+        assert pipe is self.mock_redis_client.pipeline.return_value
+
     @pytest.mark.asyncio
     async def test_get_value(self):
         self.mock_redis_client.get.return_value = "expected_value"
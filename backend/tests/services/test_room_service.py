@@ -199,3 +199,27 @@ class TestGetRoom:
         # ASSERT: Check that the cache was repopulated.
         mock_redis_service.dict_add.assert_awaited_once()
         mock_redis_service.set_add.assert_awaited_once()
+
+
+## Tests for get_rooms_page
+class TestGetRoomsPage:
+    @pytest.mark.asyncio
+    async def test_returns_page_with_next_cursor(
+        self, room_service: RoomService, mock_cosmos_service: AsyncMock
+    ):
+        # ARRANGE
+        rooms = [{"id": "room1"}, {"id": "room2"}]
+        mock_cosmos_service.paginate_query.return_value = (rooms, "cursor-2")
+
+        # ACT
+        page = await room_service.get_rooms_page(page_size=2, continuation_token="c1")
+
+        # ASSERT
+        assert page.items == rooms
+        assert page.next == "cursor-2"
+        mock_cosmos_service.paginate_query.assert_awaited_once_with(
+            query="SELECT * FROM c",
+            container_type="rooms",
+            page_size=2,
+            continuation_token="c1",
+        )
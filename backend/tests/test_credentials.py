@@ -0,0 +1,39 @@
+from app import credentials
+
+
+def test_uses_managed_identity_when_hosted_in_azure(mocker, monkeypatch):
+    # ARRANGE
+    monkeypatch.setattr(
+        credentials.settings, "IDENTITY_ENDPOINT", "http://localhost:42356/msi/token"
+    )
+    monkeypatch.setattr(credentials.settings, "AZURE_CLIENT_ID", "client-id")
+    managed = mocker.patch("app.credentials.ManagedIdentityCredential")
+    default = mocker.patch("app.credentials.DefaultAzureCredential")
+    credentials.get_azure_credential.cache_clear()
+
+    # ACT
+    credential = credentials.get_azure_credential()
+
+    # ASSERT
+    assert credential is managed.return_value
+    managed.assert_called_once_with(client_id="client-id")
+    default.assert_not_called()
+    credentials.get_azure_credential.cache_clear()
+
+
+def test_uses_default_chain_outside_azure(mocker, monkeypatch):
+    # ARRANGE
+    monkeypatch.setattr(credentials.settings, "IDENTITY_ENDPOINT", None)
+    managed = mocker.patch("app.credentials.ManagedIdentityCredential")
+    default = mocker.patch("app.credentials.DefaultAzureCredential")
+    credentials.get_azure_credential.cache_clear()
+
+    # ACT
+    first = credentials.get_azure_credential()
+    second = credentials.get_azure_credential()
+
+    # ASSERT: one shared instance
+    assert first is second is default.return_value
+    default.assert_called_once()
+    managed.assert_not_called()
+    credentials.get_azure_credential.cache_clear()